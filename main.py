@@ -26,20 +26,28 @@ import json
 import logging
 import math
 import os
+import pickle
 import queue
+import random
+import re
 import sqlite3
 import sys
 import threading
 import time
 import uuid
-from collections import deque
-from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from enum import Enum
 from functools import lru_cache
+from itertools import accumulate, islice
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
 
 import requests
 import customtkinter as ctk
@@ -64,19 +72,39 @@ except Exception:
     aiohttp = None  # type: ignore
     AIOHTTP_AVAILABLE = False
 
+try:
+    import orjson  # type: ignore
+    ORJSON_AVAILABLE = True
+except Exception:
+    orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
+
 IS_WINDOWS = sys.platform == "win32"
 IS_MACOS = sys.platform == "darwin"
 IS_LINUX = sys.platform.startswith("linux")
 
+# pywinstyles is only probed here; the import itself is deferred to first use
 PYWINSTYLES_AVAILABLE = False
 if IS_WINDOWS:
     try:
-        import pywinstyles  # type: ignore
-        PYWINSTYLES_AVAILABLE = True
+        import importlib.util
+        PYWINSTYLES_AVAILABLE = importlib.util.find_spec("pywinstyles") is not None
     except Exception:
         PYWINSTYLES_AVAILABLE = False
 
 
+@lru_cache(maxsize=None)
+def _load_pywinstyles() -> Any:
+    """Import pywinstyles once, on demand (None when unavailable)."""
+    if not PYWINSTYLES_AVAILABLE:
+        return None
+    try:
+        import pywinstyles  # type: ignore
+        return pywinstyles
+    except Exception:
+        return None
+
+
 # =============================================================================
 # Logging
 # =============================================================================
@@ -175,6 +203,7 @@ class AppConfiguration:
     API_TIMEOUT: int = 15
     API_RETRY_COUNT: int = 3
     API_RETRY_DELAY: float = 1.0  # base delay
+    API_RATE_LIMIT_RPM: int = 30  # per host, sliding 60 s window
     VERIFY_SSL: bool = True
     USER_AGENT: str = "LiquidGheymat/4.0 (Desktop)"
 
@@ -185,6 +214,7 @@ class AppConfiguration:
 
     # Cache
     CACHE_DURATION: int = 45  # in-memory seconds
+    API_CACHE_PATH: str = "liquid_glass_api_cache.json"  # last payload, reused across restarts within CACHE_DURATION
     DATABASE_PATH: str = "liquid_glass_data.db"
 
     # Performance
@@ -711,86 +741,274 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
 }
 
 
+# Intern language codes and keys so lookups can short-circuit on identity.
+TRANSLATIONS = {
+    sys.intern(lang): {sys.intern(k): v for k, v in tbl.items()} for lang, tbl in TRANSLATIONS.items()
+}
+
+
+def _merge_translations() -> Dict[str, Dict[str, str]]:
+    """Overlay every language on English once so lookups need a single probe."""
+    en = TRANSLATIONS["en"]
+    return {lang: {**en, **{k: v for k, v in tbl.items() if v}} for lang, tbl in TRANSLATIONS.items()}
+
+
+def _placeholder_keys() -> Dict[str, bool]:
+    """Map each key to whether any language's template takes format arguments."""
+    out: Dict[str, bool] = {}
+    for tbl in _MERGED.values():
+        for k, v in tbl.items():
+            out[k] = out.get(k, False) or ("{" in v)
+    return out
+
+
+_MERGED: Dict[str, Dict[str, str]] = _merge_translations()
+_HAS_PLACEHOLDER: Dict[str, bool] = _placeholder_keys()
+
+
+@lru_cache(maxsize=4096)
+def _tr_plain(lang_key: str, key: str) -> str:
+    """Resolve a raw template (memoized; keys and languages are a small fixed set)."""
+    return _MERGED.get(lang_key, _MERGED["en"]).get(key, key)
+
+
 def tr(lang: str, key: str, **kwargs) -> str:
     """Lightweight translation helper with safe fallback to English."""
-    lang_key = str(lang or "en").lower()
-    base = TRANSLATIONS.get(lang_key, TRANSLATIONS["en"])
-    template = base.get(key) or TRANSLATIONS["en"].get(key) or key
+    lang_key = lang if lang in _MERGED else (str(lang).lower() if lang else "en")
+    template = _tr_plain(lang_key, key)
+    if not kwargs or not _HAS_PLACEHOLDER.get(key, True):
+        return template
     try:
         return template.format(**kwargs)
     except Exception:
         return template
 
 
+def tr_cache_clear() -> None:
+    """Drop memoized translation lookups (call after TRANSLATIONS or the UI language changes)."""
+    global _MERGED, _HAS_PLACEHOLDER
+    if set(_MERGED) != set(TRANSLATIONS):
+        _MERGED = _merge_translations()
+        _HAS_PLACEHOLDER = _placeholder_keys()
+    _tr_plain.cache_clear()
+
+
+_RTL_LANGS = frozenset({"fa", "ar", "he", "ur"})
+
+
+@lru_cache(maxsize=16)
 def is_rtl(lang: str) -> bool:
-    return str(lang or "").lower().startswith("fa")
+    return str(lang or "").lower().split("-", 1)[0] in _RTL_LANGS
+
+
+_EN2FA = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
+_TO_EN_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩", "01234567890123456789")
+
+
+def fa_digits(s: str) -> str:
+    """ASCII digits -> Persian digits."""
+    return s.translate(_EN2FA)
+
+
+def en_digits(s: str) -> str:
+    """Persian / Arabic-Indic digits -> ASCII digits."""
+    return s.translate(_TO_EN_DIGITS)
 
 
 # =============================================================================
 # Database
 # =============================================================================
 
+def _json_dumps(obj: Any) -> str:
+    """Serialize to a JSON string (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _json_dumpb(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes (for BLOB columns)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: Any) -> Any:
+    """Parse JSON from str or bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _float_or_none(v: Any) -> Optional[float]:
+    try:
+        return float(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _iter_cached_rows(cursor: Iterable[Tuple[str, Any, float]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream (symbol, item) pairs from currency_cache rows, skipping undecodable ones."""
+    for sym, raw, ts in cursor:
+        try:
+            # BLOB rows are UTF-8 bytes; older databases still hold TEXT.
+            item = _json_loads(raw)
+        except Exception:
+            continue
+        if isinstance(item, dict):
+            item.setdefault("symbol", sym)
+            item.setdefault("timestamp", ts)
+            yield sym, item
+
+
+@lru_cache(maxsize=4096)
+def _norm_sym(sym: str) -> str:
+    """Upper-cased, stripped symbol (symbols come from a small stable set)."""
+    return sys.intern(str(sym).upper().strip())
+
+
+def _norm_history_row(row: Tuple[str, float, float]) -> Tuple[str, float, float]:
+    sym, ts, price = row
+    return (_norm_sym(sym), float(ts), float(price))
+
+
 class DatabaseManager:
-    """SQLite store for cache + preferences."""
+    """SQLite store for cache + preferences (one shared WAL connection)."""
 
     def __init__(self, db_path: str):
         self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending_prefs: Dict[str, Any] = {}
+        self._prefs_timer: Optional[threading.Timer] = None
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+        except Exception as e:
+            logger.error(f"Database open failed: {e}")
         self._init_database()
 
+    @contextmanager
+    def _transaction(self, mode: str = "") -> Iterator[sqlite3.Connection]:
+        """Group several statements into one commit on the shared connection."""
+        with self._lock:
+            conn = self._conn
+            conn.execute(f"BEGIN {mode}".rstrip())
+            try:
+                yield conn
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._prefs_timer is not None:
+                self._prefs_timer.cancel()
+            self._flush_prefs()
+            try:
+                if self._conn is not None:
+                    self._conn.close()
+            except Exception as e:
+                logger.debug(f"Database close failed: {e}")
+            self._conn = None
+
+    # Bump when the schema below changes; warm starts skip all DDL while it matches.
+    _SCHEMA_VERSION = 2
+
+    _SCHEMA_TABLES = """
+        CREATE TABLE IF NOT EXISTS currency_cache (
+            symbol TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            timestamp REAL NOT NULL,
+            name TEXT,
+            price REAL,
+            change_percent REAL
+        );
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            type TEXT
+        );
+        CREATE TABLE IF NOT EXISTS selected_currencies (
+            symbol TEXT PRIMARY KEY,
+            added_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS price_history (
+            symbol TEXT NOT NULL,
+            ts REAL NOT NULL,
+            price REAL NOT NULL,
+            PRIMARY KEY(symbol, ts)
+        );
+        CREATE TABLE IF NOT EXISTS desktop_widgets (
+            widget_id TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            created_at REAL NOT NULL
+        );
+    """
+
+    _SCHEMA_INDEXES = """
+        CREATE INDEX IF NOT EXISTS idx_cc_change ON currency_cache(change_percent DESC);
+        -- Covering index: history reads (symbol, ts >= ?) -> (ts, price) never touch the table.
+        CREATE INDEX IF NOT EXISTS idx_ph_cover ON price_history(symbol, ts, price);
+    """
+
     def _init_database(self) -> None:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS currency_cache (
-                        symbol TEXT PRIMARY KEY,
-                        data TEXT NOT NULL,
-                        timestamp REAL NOT NULL
-                    )
-                """)
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS user_preferences (
-                        key TEXT PRIMARY KEY,
-                        value TEXT NOT NULL
-                    )
-                """)
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS selected_currencies (
-                        symbol TEXT PRIMARY KEY,
-                        added_at REAL NOT NULL
-                    )
-                """)
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS price_history (
-                        symbol TEXT NOT NULL,
-                        ts REAL NOT NULL,
-                        price REAL NOT NULL,
-                        PRIMARY KEY(symbol, ts)
-                    )
-                """)
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS desktop_widgets (
-                        widget_id TEXT PRIMARY KEY,
-                        data TEXT NOT NULL,
-                        created_at REAL NOT NULL
-                    )
-                """)
-                conn.commit()
+            with self._lock:
+                conn = self._conn
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= self._SCHEMA_VERSION:
+                    return
+                conn.executescript(f"BEGIN; {self._SCHEMA_TABLES} COMMIT;")
+                # Tables created by pre-versioned builds lack the flattened columns.
+                self._ensure_columns(conn, "currency_cache", {"name": "TEXT", "price": "REAL", "change_percent": "REAL"})
+                self._ensure_columns(conn, "user_preferences", {"type": "TEXT"})
+                conn.executescript(f"BEGIN; {self._SCHEMA_INDEXES} PRAGMA user_version={self._SCHEMA_VERSION}; COMMIT;")
         except Exception as e:
             logger.error(f"Database init failed: {e}")
 
+    @staticmethod
+    def _ensure_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]) -> None:
+        """Add columns missing from tables created by older versions."""
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, decl in columns.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
     # ----- cache -----
 
     def cache_bulk_currency_data(self, currencies: Dict[str, Dict[str, Any]]) -> None:
         """Cache the latest dataset for faster startup."""
         try:
             now = time.time()
-            rows = [(sym, json.dumps(data, ensure_ascii=False), now) for sym, data in currencies.items()]
-            with sqlite3.connect(self.db_path) as conn:
+            rows = [
+                (
+                    sym,
+                    _json_dumpb(data),
+                    now,
+                    data.get("name"),
+                    _float_or_none(data.get("price")),
+                    _float_or_none(data.get("change_percent")),
+                )
+                for sym, data in currencies.items()
+            ]
+            with self._transaction() as conn:
                 conn.executemany(
-                    "INSERT OR REPLACE INTO currency_cache(symbol, data, timestamp) VALUES (?, ?, ?)",
+                    "INSERT OR REPLACE INTO currency_cache(symbol, data, timestamp, name, price, change_percent) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
                     rows,
                 )
-                conn.commit()
         except Exception as e:
             logger.debug(f"Bulk cache write failed: {e}")
 
@@ -798,67 +1016,118 @@ class DatabaseManager:
         """Load cached dataset (not expired)."""
         try:
             cutoff = time.time() - max_age_seconds
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
+            with self._lock:
+                cursor = self._conn.execute(
                     "SELECT symbol, data, timestamp FROM currency_cache WHERE timestamp >= ?",
                     (cutoff,),
                 )
-                out: Dict[str, Dict[str, Any]] = {}
-                for sym, raw, ts in cursor.fetchall():
-                    try:
-                        item = json.loads(raw)
-                        if isinstance(item, dict):
-                            item.setdefault("symbol", sym)
-                            item.setdefault("timestamp", ts)
-                            out[sym] = item
-                    except Exception:
-                        continue
-                return out
+                return dict(_iter_cached_rows(cursor))
         except Exception as e:
             logger.debug(f"Load cached currencies failed: {e}")
             return {}
 
+    def load_top_movers(
+        self, limit: int = 3, *, losers: bool = False, max_age_seconds: int = 6 * 3600
+    ) -> List[Tuple[str, float, float]]:
+        """Return (symbol, price, change_percent) of the biggest gainers (or losers), straight from the flat columns."""
+        sign, order = ("<", "ASC") if losers else (">", "DESC")
+        try:
+            cutoff = time.time() - max_age_seconds
+            with self._lock:
+                cursor = self._conn.execute(
+                    "SELECT symbol, price, change_percent FROM currency_cache "
+                    f"WHERE change_percent {sign} 0 AND timestamp >= ? ORDER BY change_percent {order} LIMIT ?",
+                    (cutoff, int(max(1, limit))),
+                )
+                return cursor.fetchall()
+        except Exception as e:
+            logger.debug(f"Top movers load failed: {e}")
+            return []
+
     def prune_cache(self, keep_last_seconds: int = 24 * 3600) -> None:
         """Delete old cache rows (or clear all if keep_last_seconds<=0)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._lock:
                 if keep_last_seconds <= 0:
-                    conn.execute("DELETE FROM currency_cache")
+                    self._conn.execute("DELETE FROM currency_cache")
                 else:
                     cutoff = time.time() - keep_last_seconds
-                    conn.execute("DELETE FROM currency_cache WHERE timestamp < ?", (cutoff,))
-                conn.commit()
+                    self._conn.execute("DELETE FROM currency_cache WHERE timestamp < ?", (cutoff,))
         except Exception as e:
             logger.debug(f"Cache prune failed: {e}")
 
     # ----- preferences -----
 
-    def save_preference(self, key: str, value: Any) -> None:
+    @staticmethod
+    def _encode_preference(value: Any) -> Tuple[str, str]:
+        """(type tag, text) for a preference; only containers go through JSON."""
+        if isinstance(value, bool):
+            return "b", "1" if value else "0"
+        if isinstance(value, int):
+            return "i", str(value)
+        if isinstance(value, float):
+            return "f", repr(value)
+        if isinstance(value, str):
+            return "s", value
+        return "j", _json_dumps(value)
+
+    @staticmethod
+    def _decode_preference(raw: Any, kind: Optional[str]) -> Any:
+        if kind == "s":
+            return raw
+        if kind == "b":
+            return raw == "1"
+        if kind == "i":
+            return int(raw)
+        if kind == "f":
+            return float(raw)
+        # "j" or rows written before the type column existed
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    "INSERT OR REPLACE INTO user_preferences(key, value) VALUES (?, ?)",
-                    (str(key), json.dumps(value, ensure_ascii=False)),
-                )
-                conn.commit()
-        except Exception as e:
-            logger.debug(f"Preference save failed: {e}")
+            return _json_loads(raw)
+        except Exception:
+            return raw
+
+    _PREFS_FLUSH_DELAY = 0.1
+
+    def save_preference(self, key: str, value: Any) -> None:
+        """Queue a preference write; bursts (slider drags, toggles) collapse into one transaction."""
+        with self._lock:
+            self._pending_prefs[str(key)] = value
+            if self._prefs_timer is None:
+                timer = threading.Timer(self._PREFS_FLUSH_DELAY, self._flush_prefs)
+                timer.daemon = True
+                self._prefs_timer = timer
+                timer.start()
+
+    def _flush_prefs(self) -> None:
+        with self._lock:
+            pending, self._pending_prefs = self._pending_prefs, {}
+            self._prefs_timer = None
+            if not pending:
+                return
+            try:
+                rows = [(key, *self._encode_preference(value)) for key, value in pending.items()]
+                with self._transaction() as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO user_preferences(key, type, value) VALUES (?, ?, ?)",
+                        rows,
+                    )
+            except Exception as e:
+                logger.debug(f"Preference save failed: {e}")
 
     def load_preference(self, key: str, default: Any = None) -> Any:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
-                    "SELECT value FROM user_preferences WHERE key = ?",
+            with self._lock:
+                if str(key) in self._pending_prefs:
+                    return self._pending_prefs[str(key)]
+                cursor = self._conn.execute(
+                    "SELECT value, type FROM user_preferences WHERE key = ?",
                     (str(key),),
                 )
                 row = cursor.fetchone()
             if row is None:
                 return default
-            raw = row[0]
-            try:
-                return json.loads(raw)
-            except Exception:
-                return raw
+            return self._decode_preference(row[0], row[1])
         except Exception as e:
             logger.debug(f"Preference load failed: {e}")
             return default
@@ -868,21 +1137,27 @@ class DatabaseManager:
     def save_selected_currencies(self, currencies: Iterable[str]) -> None:
         try:
             symbols = sorted({str(s).upper().strip() for s in currencies if str(s).strip()})
-            with sqlite3.connect(self.db_path) as conn:
+            now = time.time()
+            with self._transaction() as conn:
                 conn.execute("DELETE FROM selected_currencies")
-                conn.executemany(
-                    "INSERT INTO selected_currencies(symbol, added_at) VALUES (?, ?)",
-                    [(sym, time.time()) for sym in symbols],
-                )
-                conn.commit()
+                try:
+                    conn.execute(
+                        "INSERT INTO selected_currencies(symbol, added_at) SELECT value, ? FROM json_each(?)",
+                        (now, json.dumps(symbols)),
+                    )
+                except sqlite3.OperationalError:
+                    # SQLite built without JSON1
+                    conn.executemany(
+                        "INSERT INTO selected_currencies(symbol, added_at) VALUES (?, ?)",
+                        [(sym, now) for sym in symbols],
+                    )
         except Exception as e:
             logger.debug(f"Selected currencies save failed: {e}")
 
     def load_selected_currencies(self) -> set[str]:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT symbol FROM selected_currencies")
-                return {row[0] for row in cursor.fetchall()}
+            with self._lock:
+                return {row[0] for row in self._conn.execute("SELECT symbol FROM selected_currencies")}
         except Exception as e:
             logger.debug(f"Selected currencies load failed: {e}")
             return set()
@@ -895,12 +1170,11 @@ class DatabaseManager:
         if not rows:
             return
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._transaction("IMMEDIATE") as conn:
                 conn.executemany(
                     "INSERT OR REPLACE INTO price_history(symbol, ts, price) VALUES (?, ?, ?)",
-                    [(str(sym).upper().strip(), float(ts), float(price)) for sym, ts, price in rows],
+                    map(_norm_history_row, rows),
                 )
-                conn.commit()
         except Exception as e:
             logger.debug(f"History bulk insert failed: {e}")
 
@@ -909,12 +1183,13 @@ class DatabaseManager:
         if not sym:
             return []
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute(
+            with self._lock:
+                cursor = self._conn.execute(
                     "SELECT ts, price FROM price_history WHERE symbol = ? AND ts >= ? ORDER BY ts ASC LIMIT ?",
                     (sym, float(since_ts), int(max(1, limit))),
                 )
-                return [(float(ts), float(price)) for ts, price in cursor.fetchall()]
+                # Both columns are REAL, so rows already come back as (float, float) tuples.
+                return cursor.fetchall()
         except Exception as e:
             logger.debug(f"History load failed: {e}")
             return []
@@ -923,9 +1198,8 @@ class DatabaseManager:
         try:
             keep_days = int(max(1, keep_days))
             cutoff = time.time() - keep_days * 86400
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM price_history WHERE ts < ?", (float(cutoff),))
-                conn.commit()
+            with self._lock:
+                self._conn.execute("DELETE FROM price_history WHERE ts < ?", (float(cutoff),))
         except Exception as e:
             logger.debug(f"History prune failed: {e}")
 
@@ -936,12 +1210,11 @@ class DatabaseManager:
         if not wid:
             return
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
+            with self._lock:
+                self._conn.execute(
                     "INSERT OR REPLACE INTO desktop_widgets(widget_id, data, created_at) VALUES (?, ?, ?)",
-                    (wid, json.dumps(dict(data or {}), ensure_ascii=False), time.time()),
+                    (wid, pickle.dumps(dict(data or {}), protocol=pickle.HIGHEST_PROTOCOL), time.time()),
                 )
-                conn.commit()
         except Exception as e:
             logger.debug(f"Widget save failed: {e}")
 
@@ -950,20 +1223,20 @@ class DatabaseManager:
         if not wid:
             return
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM desktop_widgets WHERE widget_id = ?", (wid,))
-                conn.commit()
+            with self._lock:
+                self._conn.execute("DELETE FROM desktop_widgets WHERE widget_id = ?", (wid,))
         except Exception as e:
             logger.debug(f"Widget delete failed: {e}")
 
     def load_desktop_widgets(self) -> List[Dict[str, Any]]:
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT widget_id, data FROM desktop_widgets ORDER BY created_at ASC")
+            with self._lock:
+                cursor = self._conn.execute("SELECT widget_id, data FROM desktop_widgets ORDER BY created_at ASC")
                 out: List[Dict[str, Any]] = []
                 for wid, raw in cursor.fetchall():
                     try:
-                        item = json.loads(raw)
+                        # Local, app-written configs only; TEXT rows predate the pickle format.
+                        item = pickle.loads(raw) if isinstance(raw, bytes) else _json_loads(raw)
                         if isinstance(item, dict):
                             item.setdefault("widget_id", wid)
                             out.append(item)
@@ -978,6 +1251,45 @@ class DatabaseManager:
 db_manager = DatabaseManager(config.DATABASE_PATH)
 
 
+# =============================================================================
+# Number parsing
+# =============================================================================
+# Plain, fully annotated functions over str: no attribute lookups on the hot
+# path, and compilable as-is with mypyc/Cython if that ever becomes worthwhile.
+
+# en_digits' table plus the Arabic/Persian thousands/decimal separators
+_NUM_DIGIT_TRANS = {**_TO_EN_DIGITS, **str.maketrans("٬،٫", ",,.")}
+
+# Unit/percent tokens, whitespace and thousands separators, removed in one pass
+_NUM_STRIP_RE = re.compile(r"%|٪|ریال|تومان|USDT?|[\s,_]")
+_NUM_JUNK_RE = re.compile(r"[^0-9eE.+-]")
+
+
+def _num_clean(s: str) -> str:
+    return _NUM_STRIP_RE.sub("", s.translate(_NUM_DIGIT_TRANS))
+
+
+@lru_cache(maxsize=4096)
+def _num_parse(raw: str) -> Optional[float]:
+    """Parse a raw API value; memoized since the same strings repeat every poll."""
+    s: str = _num_clean(raw)
+    if not s:
+        return None
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    # last attempt: keep only valid characters
+    filtered: str = _NUM_JUNK_RE.sub("", s)
+    if not filtered:
+        return None
+    try:
+        return float(filtered)
+    except ValueError as e:
+        logger.warning(f"API request error: {e}")
+        return None
+
+
 # =============================================================================
 # API
 # =============================================================================
@@ -987,14 +1299,25 @@ class APIManager:
 
     def __init__(self):
         self.session = self._create_session()
+        # Backups are raced against each other once the primary has failed
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=max(1, len(config.BACKUP_API_ENDPOINTS)), thread_name_prefix="api-fetch"
+        )
         self._last_data: Optional[Dict[str, Any]] = None
         self._last_data_ts: float = 0.0
+        # True while _last_data came from disk or was served because the network is down
+        self.last_data_stale: bool = True
+        # id(payload) -> (payload, detected format); the payload ref keeps the id from being reused
+        self._format_cache: Dict[int, Tuple[Any, str]] = {}
+        self._load_disk_cache()
 
-        self.last_request_time = 0.0
-        self.rate_limit_delay = 1.0
+        # Per-host request timestamps (monotonic) and 429 back-off deadlines
+        self._rate_lock = threading.Lock()
+        self._host_windows: Dict[str, deque[float]] = defaultdict(deque)
+        self._host_backoff_until: Dict[str, float] = {}
 
         self.failure_count = 0
-        self.circuit_breaker_until = 0.0  # epoch seconds
+        self.circuit_breaker_until = 0.0  # time.monotonic() seconds
         self.circuit_breaker_base = 15.0  # seconds
 
     def _create_session(self) -> requests.Session:
@@ -1015,73 +1338,173 @@ class APIManager:
         )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
+
+        # Dedicated keep-alive pools for the hosts we poll, so concurrent backup
+        # fetches never evict each other's connections.
+        hosts = {urlparse(u).netloc for u in (config.PRIMARY_API_URL, *config.BACKUP_API_ENDPOINTS)}
+        hosts.add("api.coingecko.com")  # market charts
+        for host in filter(None, hosts):
+            session.mount(
+                f"https://{host}/",
+                requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0),
+            )
         return session
 
-    def _respect_rate_limit(self) -> None:
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+    def _load_disk_cache(self) -> None:
+        """Seed the in-memory cache from the last payload written by a previous run.
 
-    def _circuit_open(self) -> bool:
-        return time.time() < self.circuit_breaker_until
+        The payload is kept whatever its age (it is marked stale) so the first paint
+        and circuit-open fallbacks have something to show; the TTL still forces a fetch.
+        """
+        try:
+            path = Path(config.API_CACHE_PATH)
+            age = time.time() - path.stat().st_mtime
+            data = _json_loads(path.read_bytes())
+            if data:
+                self._last_data = data
+                # File age is wall-clock; rebase it onto the monotonic clock used for TTLs
+                self._last_data_ts = time.monotonic() - max(0.0, age)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"API disk cache load failed: {e}")
+
+    def cached_data(self) -> Optional[Dict[str, Any]]:
+        """Last good payload (possibly stale, see ``last_data_stale``) without touching the network."""
+        return self._last_data
+
+    def _save_disk_cache(self, data: Dict[str, Any]) -> None:
+        try:
+            path = Path(config.API_CACHE_PATH)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(_json_dumpb(data))
+            os.replace(tmp, path)  # atomic: readers never see a partial file
+        except Exception as e:
+            logger.debug(f"API disk cache write failed: {e}")
+
+    def _wait_if_throttled(self, host: str) -> bool:
+        """Sliding-window limit per host. Returns False if the host is paused for too long to wait."""
+        while True:
+            with self._rate_lock:
+                now = time.monotonic()
+                window = self._host_windows[host]
+                while window and now - window[0] >= 60.0:
+                    window.popleft()
+                wait_s = self._host_backoff_until.get(host, 0.0) - now
+                if len(window) >= config.API_RATE_LIMIT_RPM:
+                    wait_s = max(wait_s, window[0] + 60.0 - now)
+                if wait_s <= 0:
+                    window.append(now)
+                    return True
+            if wait_s > config.API_TIMEOUT:
+                return False
+            time.sleep(wait_s)
+
+    def _note_rate_limited(self, host: str, resp: requests.Response, fallback: float) -> None:
+        """Pause only this host, honouring Retry-After / X-RateLimit-* when the server sends them."""
+        headers = resp.headers
+        delay: Optional[float] = None
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except Exception:
+                    delay = None
+        if delay is None and headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset = float(headers.get("X-RateLimit-Reset", ""))
+                # Either an epoch timestamp or seconds-until-reset
+                delay = reset - time.time() if reset > 1e9 else reset
+            except ValueError:
+                delay = None
+        if delay is None or delay <= 0:
+            delay = fallback
+        with self._rate_lock:
+            self._host_backoff_until[host] = time.monotonic() + delay
+
+    def _circuit_open(self, now: float) -> bool:
+        return now < self.circuit_breaker_until
 
     def _trip_circuit(self) -> None:
         self.failure_count += 1
         backoff = min(self.circuit_breaker_base * (2 ** (self.failure_count - 1)), 300.0)
-        self.circuit_breaker_until = time.time() + backoff
+        backoff *= 0.8 + 0.4 * random.random()  # jitter: clients don't all reopen together
+        self.circuit_breaker_until = time.monotonic() + backoff
 
     def fetch_data_sync(self, force: bool = False, skip_primary: bool = False) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
         # In-memory cache for very frequent calls
         if not force and self._last_data is not None:
-            if time.time() - self._last_data_ts < config.CACHE_DURATION:
+            if now - self._last_data_ts < config.CACHE_DURATION:
                 return self._last_data
 
-        if self._circuit_open():
-            logger.warning("Circuit breaker open — skipping network call.")
-            return None
+        if self._circuit_open(now):
+            logger.warning("Circuit breaker open — serving last good payload.")
+            if self._last_data is not None:
+                self.last_data_stale = True
+            return self._last_data
+
+        data = self._fetch_with_fallback(None if skip_primary else config.PRIMARY_API_URL, config.BACKUP_API_ENDPOINTS)
+        if data:
+            self._last_data = data
+            # TTL counts from when the payload arrived, not from when the fetch started
+            self._last_data_ts = time.monotonic()
+            self.last_data_stale = False
+            self.failure_count = 0
+            self._save_disk_cache(data)
+            return data
+
+        self._trip_circuit()
+        return None
+
+    def _fetch_with_fallback(self, primary_url: Optional[str], backup_urls: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Primary first; only if it fails, race the backups and take the first non-empty payload.
 
-        # 1) Primary API
-        if not skip_primary:
-            data = self._request_with_retries(config.PRIMARY_API_URL, is_primary=True)
+        Backups carry only crypto/FX data and count against their hosts' rate limits,
+        so they are never requested while the primary can still answer.
+        """
+        if primary_url:
+            data = self._request_with_retries(primary_url, True)
             if data:
-                self._last_data = data
-                self._last_data_ts = time.time()
-                self.failure_count = 0
                 return data
 
-        # 2) Backups
-        for url in config.BACKUP_API_ENDPOINTS:
-            data = self._request_with_retries(url, is_primary=False)
+        futures = [self._fetch_pool.submit(self._request_with_retries, url, False) for url in backup_urls]
+        for fut in as_completed(futures):
+            data = fut.result()
             if data:
-                self._last_data = data
-                self._last_data_ts = time.time()
-                self.failure_count = 0
+                # Queued requests are dropped; in-flight ones finish in the background.
+                for other in futures:
+                    other.cancel()
                 return data
-
-        self._trip_circuit()
         return None
 
     def _request_with_retries(self, url: str, is_primary: bool) -> Optional[Dict[str, Any]]:
         delay = config.API_RETRY_DELAY
+        host = urlparse(url).netloc
         last_err: str = ""
         for attempt in range(1, config.API_RETRY_COUNT + 1):
             try:
-                self._respect_rate_limit()
+                if not self._wait_if_throttled(host):
+                    last_err = "Rate limited (host paused)"
+                    break
                 resp = self.session.get(url, timeout=config.API_TIMEOUT, verify=config.VERIFY_SSL)
                 if resp.status_code == 429:
-                    logger.warning("Rate limited (429).")
-                    self.rate_limit_delay = min(max(self.rate_limit_delay, 1.0) * 1.5, 10.0)
-                    time.sleep(min(delay * attempt, 10.0))
+                    logger.warning(f"Rate limited (429) by {host}.")
+                    self._note_rate_limited(host, resp, min(delay * attempt, 10.0))
                     continue
 
                 resp.raise_for_status()
+                # Parse the raw bytes directly (no text decode / charset sniffing)
+                raw = resp.content.lstrip(b"\xef\xbb\xbf").strip()
                 try:
-                    data = resp.json()
-                except Exception:
-                    raw = (resp.text or "").strip()
-                    raw = raw.lstrip("\ufeff").strip()
-                    data = json.loads(raw) if raw else None
+                    data = _json_loads(raw) if raw else None
+                except ValueError:
+                    # Body in a non-UTF encoding: let requests decode it
+                    text = (resp.text or "").strip().lstrip("\ufeff").strip()
+                    data = json.loads(text) if text else None
                 if not data:
                     raise ValueError("Empty response")
                 return data
@@ -1099,7 +1522,7 @@ class APIManager:
                 last_err = f"Unexpected: {e}"
                 logger.debug(f"Unexpected error ({attempt}/{config.API_RETRY_COUNT}) for {url}: {e}")
 
-            time.sleep(min(delay * attempt, 6.0))
+            time.sleep(min(delay * attempt, 6.0) * (0.5 + random.random()))
 
         if last_err:
             logger.warning(f"API request failed for {url} (verify_ssl={config.VERIFY_SSL}): {last_err}")
@@ -1109,95 +1532,79 @@ class APIManager:
     # ----- number helpers -----
 
     @staticmethod
-    def _digits_to_en(s: str) -> str:
-        if not s:
-            return s
-        trans = str.maketrans({
-            "۰": "0", "۱": "1", "۲": "2", "۳": "3", "۴": "4",
-            "۵": "5", "۶": "6", "۷": "7", "۸": "8", "۹": "9",
-            "٠": "0", "١": "1", "٢": "2", "٣": "3", "٤": "4",
-            "٥": "5", "٦": "6", "٧": "7", "٨": "8", "٩": "9",
-            "٬": ",", "،": ",", "٫": ".",  # Arabic/Persian separators
-        })
-        return s.translate(trans)
-
-    @classmethod
-    def _clean_number_str(cls, v: Any) -> str:
+    def _safe_float(v: Any) -> Optional[float]:
         if v is None:
-            return ""
-        if isinstance(v, (int, float)):
-            return str(v)
-        s = str(v).strip()
-        s = cls._digits_to_en(s)
-        # keep digits, sign and separators only
-        # remove common tokens
-        for tok in ("%", "٪", "ریال", "تومان", "USD", "USDT"):
-            s = s.replace(tok, "")
-        s = s.strip()
-        # normalize separators
-        s = s.replace(" ", "")
-        s = s.replace("_", "")
-        # remove thousands separators
-        s = s.replace(",", "")
-        return s
-
-    @classmethod
-    def _safe_float(cls, v: Any) -> Optional[float]:
-        s = cls._clean_number_str(v)
-        if not s:
             return None
-        # handle leading/trailing junk
-        try:
-            return float(s)
-        except Exception:
-            # last attempt: keep only valid characters
-            filtered = "".join(ch for ch in s if ch.isdigit() or ch in ".-+")
-            try:
-                return float(filtered) if filtered else None
-            except Exception as e:
-                try:
-                    logger.warning(f"API request error: {e}")
-                except Exception:
-                    pass
-                return None
+        if isinstance(v, float):
+            return v
+        return _num_parse(str(v))
 
 
     # ----- data processing -----
 
+    # Field-name fallbacks in priority order, matched against lower-cased item keys
+    _SYMBOL_FIELDS = ("symbol", "code", "currency_code", "name_en")
+    _PRICE_FIELDS = ("price", "value", "rate", "sell", "buy", "last_price")
+    _CHANGE_FIELDS = ("change_percent", "change", "daily_change", "percent_change_24h")
+    _UNIT_FIELDS = ("unit", "currency", "base_currency", "quote_currency")
+    _NAME_FIELDS = ("name_fa", "name_en", "name", "title", "full_name")
+
+    _GENERIC_SYMBOL_FIELDS = ("symbol", "code")
+    _GENERIC_PRICE_FIELDS = ("price", "value", "rate")
+    _GENERIC_CHANGE_FIELDS = ("change_percent", "change")
+    _GENERIC_UNIT_FIELDS = ("unit", "currency")
+
+    _FORMAT_HANDLERS: Dict[str, str] = {
+        "primary": "_process_primary_api_format",
+        "coingecko": "_process_coingecko_simple_price",
+        "exrate": "_process_exchangerate_api",
+        "backup": "_process_backup_api_format",
+        "generic": "_process_generic_format",
+    }
+
     def process_currency_data(self, raw_data: Any) -> Dict[str, Dict[str, Any]]:
         try:
-            if self._is_primary_api_format(raw_data):
-                return self._process_primary_api_format(raw_data)
+            fmt = self._detect_format(raw_data)
+            # One timestamp for the whole batch
+            return getattr(self, self._FORMAT_HANDLERS[fmt])(raw_data, time.time())
+        except Exception as e:
+            logger.debug(f"Currency processing failed: {e}")
+            return {}
 
-            # CoinGecko "simple/price" format (backup endpoint)
-            if isinstance(raw_data, dict) and self._looks_like_coingecko_simple_price(raw_data):
-                return self._process_coingecko_simple_price(raw_data)
+    def _detect_format(self, raw_data: Any) -> str:
+        """Probe the payload shape once per payload object (cached responses are re-processed often)."""
+        hit = self._format_cache.get(id(raw_data))
+        if hit is not None and hit[0] is raw_data:
+            return hit[1]
 
+        if self._is_primary_api_format(raw_data):
+            fmt = "primary"
+        elif isinstance(raw_data, dict) and self._looks_like_coingecko_simple_price(raw_data):
+            # CoinGecko "simple/price" format (backup endpoint)
+            fmt = "coingecko"
+        elif isinstance(raw_data, dict) and isinstance(raw_data.get("rates"), dict):
             # exchangerate-api format (backup endpoint)
-            if isinstance(raw_data, dict) and isinstance(raw_data.get("rates"), dict):
-                return self._process_exchangerate_api(raw_data)
-
+            fmt = "exrate"
+        elif isinstance(raw_data, dict) and ("crypto" in raw_data or "fiat" in raw_data):
             # Other backups (explicit format)
-            if isinstance(raw_data, dict) and ("crypto" in raw_data or "fiat" in raw_data):
-                return self._process_backup_api_format(raw_data)
+            fmt = "backup"
+        else:
+            fmt = "generic"
 
-            return self._process_generic_format(raw_data)
-        except Exception as e:
-            logger.debug(f"Currency processing failed: {e}")
-            return {}
+        if len(self._format_cache) >= 8:
+            self._format_cache.clear()
+        self._format_cache[id(raw_data)] = (raw_data, fmt)
+        return fmt
+
+    _PRIMARY_INDICATORS = frozenset({"gold", "currency", "crypto", "digital_currency", "arz", "tala", "sekke"})
 
     def _is_primary_api_format(self, data: Any) -> bool:
         if not isinstance(data, dict):
             return False
 
         # Accept common primary API shapes (case-insensitive keys)
-        indicators = {"gold", "currency", "crypto", "digital_currency", "arz", "tala", "sekke"}
-        try:
-            for k in data.keys():
-                if str(k).strip().lower() in indicators:
-                    return True
-        except Exception:
-            pass
+        if not self._PRIMARY_INDICATORS.isdisjoint({str(k).strip().lower() for k in data}):
+            return True
 
         # Heuristic: lists of dict items with common fields
         for _, v in data.items():
@@ -1209,90 +1616,69 @@ class APIManager:
                 return True
         return False
 
-        indicators = ("Gold", "Currency", "Crypto", "Digital_Currency", "Arz", "Tala", "Sekke")
-        if any(k in data for k in indicators):
-            return True
-
-        # Heuristic: lists of dict items with common fields
-        for _, v in data.items():
-            if isinstance(v, list) and v and isinstance(v[0], dict):
-                sample = v[0]
-                if any(f in sample for f in ("symbol", "price", "unit", "name_fa", "name_en")):
-                    return True
-        return False
-
-    def _process_primary_api_format(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    def _process_primary_api_format(self, data: Dict[str, Any], now: float) -> Dict[str, Dict[str, Any]]:
         out: Dict[str, Dict[str, Any]] = {}
         for category_name, category_data in data.items():
             if isinstance(category_data, list):
                 for item in category_data:
-                    cur = self._process_single_currency_primary(item, str(category_name))
+                    cur = self._process_single_currency_primary(item, str(category_name), now)
                     if cur:
                         out[cur["symbol"]] = cur
             elif isinstance(category_data, dict):
                 if self._looks_like_currency_item(category_data):
-                    cur = self._process_single_currency_primary(category_data, str(category_name))
+                    cur = self._process_single_currency_primary(category_data, str(category_name), now)
                     if cur:
                         out[cur["symbol"]] = cur
                 else:
                     for sub_key, sub_data in category_data.items():
                         if isinstance(sub_data, list):
                             for item in sub_data:
-                                cur = self._process_single_currency_primary(item, f"{category_name}_{sub_key}")
+                                cur = self._process_single_currency_primary(item, f"{category_name}_{sub_key}", now)
                                 if cur:
                                     out[cur["symbol"]] = cur
         return out
 
-    def _process_single_currency_primary(self, item: Any, category: str) -> Optional[Dict[str, Any]]:
+    def _process_single_currency_primary(self, item: Any, category: str, now: float) -> Optional[Dict[str, Any]]:
         if not isinstance(item, dict):
             return None
+        item = self._normalize_item(item)
 
-        symbol = self._extract_field(item, [
-            "symbol", "Symbol", "SYMBOL", "code", "Code", "currency_code", "Currency_Code", "name_en", "Name_En"
-        ])
+        symbol = self._extract_field(item, self._SYMBOL_FIELDS)
         if not symbol:
             return None
         symbol = str(symbol).upper().strip()
         if not symbol:
             return None
 
-        price = self._extract_field(item, [
-            "price", "Price", "value", "Value", "rate", "Rate", "sell", "Sell", "buy", "Buy", "last_price", "Last_Price"
-        ], default="0")
+        price = self._extract_field(item, self._PRICE_FIELDS, default="0")
 
         price_f = self._safe_float(price)
         if price_f is None:
             return None
         price = price_f
-        change = self._extract_field(item, [
-            "change_percent", "Change_Percent", "change", "Change", "daily_change", "Daily_Change", "percent_change_24h"
-        ], default="0")
+        change = self._extract_field(item, self._CHANGE_FIELDS, default="0")
 
         ch_f = self._safe_float(change)
         change = ch_f if ch_f is not None else 0.0
-        unit = self._extract_field(item, [
-            "unit", "Unit", "currency", "Currency", "base_currency", "Base_Currency", "quote_currency", "Quote_Currency"
-        ], default="Toman")
+        unit = self._extract_field(item, self._UNIT_FIELDS, default="Toman")
 
-        name = self._extract_field(item, [
-            "name_fa", "Name_Fa", "name_en", "Name_En", "name", "Name", "title", "Title", "full_name", "Full_Name"
-        ])
+        name = self._extract_field(item, self._NAME_FIELDS)
         if not name:
             name = self._get_currency_name_by_symbol(symbol)
 
         currency = {
             "symbol": symbol,
             "name": str(name),
-            "price": str(price),
+            "price": price,
             "unit": str(unit),
-            "change_percent": str(change),
+            "change_percent": change,
             "category": category,
-            "timestamp": time.time(),
+            "timestamp": now,
             "source": "primary_api",
         }
         return currency if self._validate_currency_data(currency) else None
 
-    def _process_backup_api_format(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    def _process_backup_api_format(self, data: Dict[str, Any], now: float) -> Dict[str, Dict[str, Any]]:
         out: Dict[str, Dict[str, Any]] = {}
         for key in ("crypto", "fiat"):
             if key in data and isinstance(data[key], list):
@@ -1317,7 +1703,7 @@ class APIManager:
         except Exception:
             return False
 
-    def _process_coingecko_simple_price(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    def _process_coingecko_simple_price(self, data: Dict[str, Any], now: float) -> Dict[str, Dict[str, Any]]:
         id_to_symbol = {
             "bitcoin": "BTC",
             "ethereum": "ETH",
@@ -1367,7 +1753,9 @@ class APIManager:
 
         return out
 
-    def _process_exchangerate_api(self, data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    _COMMON_FIAT = ("USD", "EUR", "GBP", "TRY", "AED", "CAD", "AUD", "JPY", "CHF", "CNY")
+
+    def _process_exchangerate_api(self, data: Dict[str, Any], now: float) -> Dict[str, Dict[str, Any]]:
         # Example: {"base_code":"USD","rates":{"EUR":0.91,...}}
         rates = data.get("rates") or {}
         base = str(data.get("base_code") or data.get("base") or "USD").upper().strip()
@@ -1375,11 +1763,16 @@ class APIManager:
         # Convert rates so that "price" means 1 unit of currency in base currency.
         # If base=USD and rates["EUR"]=0.91 (1 USD = 0.91 EUR) => 1 EUR = 1/0.91 USD.
         out: Dict[str, Dict[str, Any]] = {}
-        common = {"USD", "EUR", "GBP", "TRY", "AED", "CAD", "AUD", "JPY", "CHF", "CNY"}
-        for sym, r in rates.items():
-            sym_u = str(sym).upper().strip()
-            if sym_u not in common:
-                continue
+        normalized: Optional[Dict[str, Any]] = None
+        # Probe the handful of wanted codes instead of walking all ~160 rates
+        for sym_u in self._COMMON_FIAT:
+            r = rates.get(sym_u)
+            if r is None:
+                if normalized is None:
+                    normalized = {str(k).upper().strip(): v for k, v in rates.items()}
+                r = normalized.get(sym_u)
+                if r is None:
+                    continue
             try:
                 r_f = float(r)
             except Exception:
@@ -1405,78 +1798,95 @@ class APIManager:
 
         return out
 
-    def _process_generic_format(self, data: Any) -> Dict[str, Dict[str, Any]]:
+    # Upper bound on candidate items taken from an unknown payload shape
+    _GENERIC_MAX_ITEMS = 1000
+
+    def _process_generic_format(self, data: Any, now: float) -> Dict[str, Dict[str, Any]]:
         out: Dict[str, Dict[str, Any]] = {}
-        items = self._extract_items_generic(data)
-        for item in items:
-            cur = self._process_single_currency_generic(item)
+        for item in islice(self._extract_items_generic(data), self._GENERIC_MAX_ITEMS):
+            cur = self._process_single_currency_generic(item, now)
             if cur and self._validate_currency_data(cur):
                 out[cur["symbol"]] = cur
         return out
 
-    def _extract_items_generic(self, data: Any) -> List[Dict[str, Any]]:
-        items: List[Dict[str, Any]] = []
+    def _extract_items_generic(self, data: Any) -> Iterator[Dict[str, Any]]:
         if isinstance(data, dict):
-            for _, v in data.items():
+            for v in data.values():
                 if isinstance(v, list):
-                    items.extend([x for x in v if isinstance(x, dict)])
+                    yield from (x for x in v if isinstance(x, dict))
                 elif isinstance(v, dict) and self._looks_like_currency_item(v):
-                    items.append(v)
+                    yield v
         elif isinstance(data, list):
-            items.extend([x for x in data if isinstance(x, dict)])
-        return items
+            yield from (x for x in data if isinstance(x, dict))
 
-    def _process_single_currency_generic(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        symbol = self._extract_field(item, ["symbol", "Symbol", "code", "Code"])
+    def _process_single_currency_generic(self, item: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+        item = self._normalize_item(item)
+        symbol = self._extract_field(item, self._GENERIC_SYMBOL_FIELDS)
         if not symbol:
             return None
 
         sym = str(symbol).upper().strip()
-        price = self._extract_field(item, ["price", "Price", "value", "Value", "rate", "Rate"], default=0)
+        price = self._extract_field(item, self._GENERIC_PRICE_FIELDS, default=0)
         price_f = self._safe_float(price)
         if price_f is None:
             return None
         price = price_f
-        change = self._extract_field(item, ["change_percent", "change", "Change"], default=0)
+        change = self._extract_field(item, self._GENERIC_CHANGE_FIELDS, default=0)
         ch_f = self._safe_float(change)
         change = ch_f if ch_f is not None else 0.0
-        unit = self._extract_field(item, ["unit", "Unit", "currency", "Currency"], default="USD")
+        unit = self._extract_field(item, self._GENERIC_UNIT_FIELDS, default="USD")
         name = self._get_currency_name_by_symbol(sym)
 
         return {
             "symbol": sym,
             "name": name,
-            "price": str(price),
+            "price": price,
             "unit": str(unit),
-            "change_percent": str(change),
-            "timestamp": time.time(),
+            "change_percent": change,
+            "timestamp": now,
             "source": "generic",
         }
 
+    _SYMBOL_KEYS = frozenset({"symbol", "Symbol", "code", "name_en"})
+    _PRICE_KEYS = frozenset({"price", "Price", "value"})
+
     def _looks_like_currency_item(self, item: Dict[str, Any]) -> bool:
-        essentials = (("symbol", "price"), ("Symbol", "Price"), ("code", "value"), ("name_en", "price"))
-        return any(all(k in item for k in pair) for pair in essentials)
+        keys = item.keys()
+        return not self._SYMBOL_KEYS.isdisjoint(keys) and not self._PRICE_KEYS.isdisjoint(keys)
+
+    @staticmethod
+    def _normalize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Lower-case keys once so each field needs one probe per canonical name (not per spelling)."""
+        return {str(k).lower(): v for k, v in item.items()}
 
     def _extract_field(self, data: Dict[str, Any], field_names: Sequence[str], default: Any = None) -> Any:
         for name in field_names:
-            if name in data:
-                val = data.get(name)
-                if val is not None and str(val).strip() != "":
-                    return val
+            val = data.get(name)
+            if val is None or val == "":
+                continue
+            # Only whitespace-only strings need a closer look; no str() per candidate.
+            if isinstance(val, str) and val.isspace():
+                continue
+            return val
         return default
 
     def _validate_currency_data(self, currency: Dict[str, Any]) -> bool:
-        for field in ("symbol", "name", "price", "unit"):
+        for field in ("symbol", "name", "unit"):
             if not str(currency.get(field, "")).strip():
                 return False
 
-        price_f = self._safe_float(currency.get("price"))
-        if price_f is None:
-            return False
+        # Builders hand over already-parsed floats; only foreign values need parsing.
+        price_f = currency.get("price")
+        if not isinstance(price_f, float):
+            price_f = self._safe_float(price_f)
+            if price_f is None:
+                return False
         # store normalized numeric string (UI formatting will re-apply separators)
         currency["price"] = str(price_f)
 
-        ch_f = self._safe_float(currency.get("change_percent", 0) or 0)
+        ch_f = currency.get("change_percent", 0) or 0
+        if not isinstance(ch_f, float):
+            ch_f = self._safe_float(ch_f)
         if ch_f is None:
             currency["change_percent"] = "0"
         else:
@@ -1485,36 +1895,39 @@ class APIManager:
 
 
 
-    def _get_currency_name_by_symbol(self, symbol: str) -> str:
-        # Keep this map compact but useful for Iranian users
-        currency_map = {
-            "USD": "دلار آمریکا",
-            "EUR": "یورو",
-            "GBP": "پوند انگلیس",
-            "AED": "درهم امارات",
-            "TRY": "لیر ترکیه",
-            "CNY": "یوان چین",
-            "SAR": "ریال عربستان",
-            "IQD": "دینار عراق",
-            "AFN": "افغانی افغانستان",
-
-            "BTC": "بیت کوین",
-            "ETH": "اتریوم",
-            "BNB": "بایننس کوین",
-            "XRP": "ریپل",
-            "SOL": "سولانا",
-            "ADA": "کاردانو",
-            "DOGE": "دوج کوین",
-
-            "GOLD": "طلا",
-            "SILVER": "نقره",
-            "SEKEH": "سکه طلا",
-            "GERAM18": "گرم طلای ۱۸ عیار",
-            "GERAM24": "گرم طلای ۲۴ عیار",
-            "MESGHAL": "مثقال طلا",
-            "OUNCE": "اونس طلا",
-        }
-        return currency_map.get(symbol, symbol)
+    # Keep this map compact but useful for Iranian users
+    _CURRENCY_NAMES: Dict[str, str] = {
+        "USD": "دلار آمریکا",
+        "EUR": "یورو",
+        "GBP": "پوند انگلیس",
+        "AED": "درهم امارات",
+        "TRY": "لیر ترکیه",
+        "CNY": "یوان چین",
+        "SAR": "ریال عربستان",
+        "IQD": "دینار عراق",
+        "AFN": "افغانی افغانستان",
+
+        "BTC": "بیت کوین",
+        "ETH": "اتریوم",
+        "BNB": "بایننس کوین",
+        "XRP": "ریپل",
+        "SOL": "سولانا",
+        "ADA": "کاردانو",
+        "DOGE": "دوج کوین",
+
+        "GOLD": "طلا",
+        "SILVER": "نقره",
+        "SEKEH": "سکه طلا",
+        "GERAM18": "گرم طلای ۱۸ عیار",
+        "GERAM24": "گرم طلای ۲۴ عیار",
+        "MESGHAL": "مثقال طلا",
+        "OUNCE": "اونس طلا",
+    }
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_currency_name_by_symbol(symbol: str) -> str:
+        return APIManager._CURRENCY_NAMES.get(symbol, symbol)
 
     @staticmethod
     def get_fallback_data() -> Dict[str, Dict[str, Any]]:
@@ -1563,23 +1976,31 @@ class APIManager:
         url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
         params = {"vs_currency": "usd", "days": str(days), "interval": "hourly"}
         try:
+            if not self._wait_if_throttled("api.coingecko.com"):
+                return []
             r = self.session.get(url, params=params, timeout=config.API_TIMEOUT, verify=config.VERIFY_SSL)
+            if r.status_code == 429:
+                self._note_rate_limited("api.coingecko.com", r, 10.0)
             if r.status_code != 200:
                 return []
-            payload = r.json() if r.content else {}
+            payload = _json_loads(r.content) if r.content else {}
             prices = payload.get("prices") or []
-            points: List[Tuple[float, float]] = []
-            for item in prices:
-                try:
-                    ts_ms = float(item[0])
-                    price = float(item[1])
-                    points.append((ts_ms / 1000.0, price))
-                except Exception:
-                    continue
-            return points
+            return [p for p in map(self._chart_point, prices) if p is not None]
         except Exception:
             return []
 
+    @staticmethod
+    def _chart_point(item: Any) -> Optional[Tuple[float, float]]:
+        """Convert one CoinGecko [ts_ms, price] pair; None for malformed or non-finite rows."""
+        try:
+            ts_ms = float(item[0])
+            price = float(item[1])
+        except Exception:
+            return None
+        if not (math.isfinite(ts_ms) and math.isfinite(price)):
+            return None
+        return ts_ms / 1000.0, price
+
 
 # =============================================================================
 # Visual Effects
@@ -1596,8 +2017,9 @@ class VisualEffectsManager:
 
     def reset_to_normal(self) -> None:
         try:
-            if IS_WINDOWS and PYWINSTYLES_AVAILABLE:
-                pywinstyles.apply_style(self.window, "normal")  # type: ignore[name-defined]
+            pws = _load_pywinstyles()
+            if pws is not None:
+                pws.apply_style(self.window, "normal")
             self.window.attributes("-alpha", 1.0)
             self.window.update_idletasks()
             self.current_effect = "normal"
@@ -1642,7 +2064,8 @@ class VisualEffectsManager:
         self.is_applying = True
         try:
             # reset_to_normal already clears styles on Windows + restores alpha
-            self.reset_to_normal()
+            if self.current_effect != "normal":
+                self.reset_to_normal()
             try:
                 self.window.attributes("-alpha", 1.0)
             except Exception:
@@ -1658,7 +2081,8 @@ class VisualEffectsManager:
             return
         self.is_applying = True
         try:
-            self.reset_to_normal()
+            if self.current_effect != "normal":
+                self.reset_to_normal()
             try:
                 self.window.attributes("-alpha", 1.0)
             except Exception:
@@ -1680,9 +2104,11 @@ class VisualEffectsManager:
 
         self.is_applying = True
         try:
-            self.reset_to_normal()
+            if self.current_effect != "normal":
+                self.reset_to_normal()
 
-            if not (IS_WINDOWS and PYWINSTYLES_AVAILABLE):
+            pws = _load_pywinstyles()
+            if pws is None:
                 self.window.attributes("-alpha", simulation_alpha)
                 self.current_effect = f"{target}_simulation"
                 self.transparency_level = simulation_alpha
@@ -1690,9 +2116,9 @@ class VisualEffectsManager:
 
             for style_name, alpha in candidates:
                 try:
-                    pywinstyles.apply_style(self.window, style_name)  # type: ignore[name-defined]
+                    pws.apply_style(self.window, style_name)
+                    # No update_idletasks: Tk applies the alpha change on the next idle pass
                     self.window.attributes("-alpha", alpha)
-                    self.window.update_idletasks()
                     self.current_effect = target
                     self.transparency_level = alpha
                     return
@@ -1721,7 +2147,9 @@ class VisualEffectsManager:
 class PerformanceMonitor:
     def __init__(self):
         self.start_time = time.time()
-        self.metrics = {
+        # inc() runs on the UI thread and on API worker threads
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, int] = {
             "ui_updates": 0,
             "api_calls": 0,
             "cache_loads": 0,
@@ -1729,16 +2157,18 @@ class PerformanceMonitor:
         }
 
     def inc(self, key: str) -> None:
-        if key in self.metrics:
-            self.metrics[key] += 1
+        with self._lock:
+            self.metrics[key] = self.metrics.get(key, 0) + 1
 
     def report(self) -> Dict[str, Any]:
         runtime = max(0.001, time.time() - self.start_time)
+        with self._lock:
+            metrics = dict(self.metrics)
         return {
             "runtime_seconds": runtime,
             "runtime_formatted": str(timedelta(seconds=int(runtime))),
-            "metrics": dict(self.metrics),
-            "ui_updates_per_min": self.metrics["ui_updates"] / (runtime / 60.0),
+            "metrics": metrics,
+            "ui_updates_per_min": metrics["ui_updates"] / (runtime / 60.0),
         }
 
 
@@ -1749,6 +2179,15 @@ performance_monitor = PerformanceMonitor()
 # UI Components
 # =============================================================================
 
+def _default_font(size: int, bold: bool = False) -> Tuple[Any, ...]:
+    return (config.FALLBACK_FONT, size, "bold") if bold else (config.FALLBACK_FONT, size)
+
+
+def _memo_font_getter(getter: Callable[..., Tuple[Any, ...]]) -> Callable[..., Tuple[Any, ...]]:
+    """Reuse the same font tuple for repeated (size, bold) requests."""
+    return lru_cache(maxsize=32)(getter)
+
+
 class ToastManager:
     """Stackable toast notifications (top-right)."""
 
@@ -1760,13 +2199,27 @@ class ToastManager:
         rtl: bool = False,
     ):
         self.root = root
-        self._toasts: List[ctk.CTkFrame] = []
+        # Visible toasts (oldest first) with their measured (w, h), and hidden ones kept for reuse
+        # Keyed by id(frame); dict order keeps oldest first
+        self._toasts: Dict[int, Tuple[ctk.CTkFrame, ctk.CTkLabel, int, int]] = {}
+        self._pool: List[Tuple[ctk.CTkFrame, ctk.CTkLabel]] = []
+        self._after_ids: Dict[int, str] = {}
         self.max_toasts = 3
         self.offset_x = 16
         self.offset_y = 16
         self.gap = 10
+        # Bursts of show()/dismiss collapse into one idle-time layout pass
+        self._reposition_pending = False
+        # Single-line toast height, measured on first use (reset when the font changes)
+        self._toast_h = 0
+        # Root width tracked from <Configure> so layout passes don't query Tk for it
+        self._root_w = 0
+        try:
+            self.root.bind("<Configure>", self._on_root_configure, add="+")
+        except Exception:
+            pass
 
-        self.font_getter = font_getter or (lambda size, bold=False: (config.FALLBACK_FONT, size, "bold") if bold else (config.FALLBACK_FONT, size))
+        self.font_getter = _memo_font_getter(font_getter or _default_font)
         self.rtl = rtl
 
     def set_typography(
@@ -1776,64 +2229,173 @@ class ToastManager:
         rtl: Optional[bool] = None,
     ) -> None:
         if font_getter is not None:
-            self.font_getter = font_getter
+            # Re-wrapping also drops tuples built for the previous font family
+            self.font_getter = _memo_font_getter(font_getter)
+            self._toast_h = 0
         if rtl is not None:
             self.rtl = rtl
 
     def show(self, message: str, duration: int = 2800) -> None:
         try:
-            toast = ctk.CTkFrame(
-                self.root,
-                fg_color=(colors.glass_overlay_light, colors.glass_overlay_dark),
-                corner_radius=12,
-                border_width=1,
-                border_color=(colors.border_light, colors.border_dark),
-            )
-            label = ctk.CTkLabel(
-                toast,
+            toast, label = self._acquire()
+            label.configure(
                 text=message,
                 font=self.font_getter(13, False),
-                text_color=(colors.text_primary_light, colors.text_primary_dark),
                 anchor="e" if self.rtl else "w",
                 justify="right" if self.rtl else "left",
             )
-            label.pack(padx=14, pady=10)
-
-            self._toasts.append(toast)
+            # Content is fixed from here on: measure once so layout passes are pure arithmetic
+            toast.update_idletasks()
+            w = toast.winfo_reqwidth()
+            if "\n" in message:
+                h = toast.winfo_reqheight()
+            else:
+                if not self._toast_h:
+                    self._toast_h = toast.winfo_reqheight()
+                h = self._toast_h
+            self._toasts[id(toast)] = (toast, label, w, h)
             if len(self._toasts) > self.max_toasts:
-                old = self._toasts.pop(0)
-                try:
-                    old.destroy()
-                except Exception:
-                    pass
+                self._release(self._toasts.pop(next(iter(self._toasts))))
 
-            self._reposition()
-            self.root.after(duration, lambda: self._dismiss(toast))
+            self._schedule_reposition()
+            self._after_ids[id(toast)] = self.root.after(duration, lambda: self._dismiss(toast))
         except Exception as e:
             logger.debug(f"Toast failed: {e}")
 
+    def clear_all(self) -> None:
+        toasts, self._toasts = self._toasts, {}
+        for entry in toasts.values():
+            self._release(entry)
+
+    def _acquire(self) -> Tuple[ctk.CTkFrame, ctk.CTkLabel]:
+        """Reuse a hidden toast when possible; build one only if the pool is empty."""
+        if self._pool:
+            return self._pool.pop()
+        toast = ctk.CTkFrame(
+            self.root,
+            fg_color=(colors.glass_overlay_light, colors.glass_overlay_dark),
+            corner_radius=12,
+            border_width=1,
+            border_color=(colors.border_light, colors.border_dark),
+        )
+        label = ctk.CTkLabel(
+            toast,
+            text="",
+            font=self.font_getter(13, False),
+            text_color=(colors.text_primary_light, colors.text_primary_dark),
+        )
+        label.pack(padx=14, pady=10)
+        # Drop bookkeeping if Tk destroys the toast underneath us (e.g. on app close)
+        toast.bind("<Destroy>", lambda _e, key=id(toast): self._forget(key), add="+")
+        return toast, label
+
+    def _forget(self, key: int) -> None:
+        self._toasts.pop(key, None)
+        self._after_ids.pop(key, None)
+        self._pool = [entry for entry in self._pool if id(entry[0]) != key]
+
+    def _release(self, entry: Tuple[ctk.CTkFrame, ctk.CTkLabel, int, int]) -> None:
+        toast, label = entry[0], entry[1]
+        # A stale dismiss timer must not hide the toast once it is reused
+        after_id = self._after_ids.pop(id(toast), None)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+        toast.place_forget()
+        if len(self._pool) <= self.max_toasts:
+            self._pool.append((toast, label))
+        else:
+            toast.destroy()
+
     def _dismiss(self, toast: ctk.CTkFrame) -> None:
+        entry = self._toasts.pop(id(toast), None)
+        # Only a real removal needs a layout pass
+        if entry is not None:
+            self._release(entry)
+            self._schedule_reposition()
+
+    def _on_root_configure(self, event: Any) -> None:
+        # The root's bindtag also sees <Configure> from every child widget
+        if event.widget is self.root:
+            self._root_w = int(event.width)
+
+    def _schedule_reposition(self) -> None:
+        if self._reposition_pending:
+            return
+        self._reposition_pending = True
         try:
-            if toast in self._toasts:
-                self._toasts.remove(toast)
-            toast.destroy()
+            self.root.after_idle(self._do_reposition)
         except Exception:
-            pass
-        self._reposition()
+            self._reposition_pending = False
 
-    def _reposition(self) -> None:
+    def _do_reposition(self) -> None:
+        self._reposition_pending = False
         try:
-            for i, toast in enumerate(reversed(self._toasts)):
-                toast.update_idletasks()
-                w = toast.winfo_reqwidth()
-                h = toast.winfo_reqheight()
-                x = self.root.winfo_width() - w - self.offset_x
-                y = self.offset_y + i * (h + self.gap)
-                toast.place(x=x, y=y)
+            if not self._toasts:
+                return
+            root_w = self._root_w or self.root.winfo_width()
+            # Sizes were measured in show(); this pass only issues place() calls
+            entries = list(reversed(self._toasts.values()))
+            ys = accumulate((e[3] + self.gap for e in entries[:-1]), initial=self.offset_y)
+            for (toast, _, w, _), y in zip(entries, ys):
+                toast.place(x=root_w - w - self.offset_x, y=y)
         except Exception:
             pass
 
 
+# Card name truncation
+_NAME_MAX = 36
+_NAME_CUT = 33
+_NAME_ELLIPSIS = "\u2026"
+
+
+@lru_cache(maxsize=512)
+def _change_text(bucket: str, val: float) -> str:
+    if bucket == "pos":
+        return f"↗ +{val:.2f}%"
+    if bucket == "neg":
+        return f"↘ {val:.2f}%"
+    return "0.00%"
+
+
+def _change_style(bucket: str) -> Tuple[Any, Any]:
+    """(pill color, text color) for a sign bucket, read from the active palette."""
+    if bucket == "pos":
+        return colors.accent_green, "white"
+    if bucket == "neg":
+        return colors.accent_red, "white"
+    return (colors.separator_light, colors.separator_dark), (colors.text_primary_light, colors.text_primary_dark)
+
+
+def _truncate_price_text(s: str) -> str:
+    return s[:12] + "…" if len(s) > 12 else s
+
+
+@lru_cache(maxsize=1024)
+def _format_price_num(val: float) -> str:
+    """Compact price text for a numeric value."""
+    if val >= 1_000_000_000:
+        return f"{val/1_000_000_000:.2f}B"
+    if val >= 1_000_000:
+        return f"{val/1_000_000:.2f}M"
+    if val >= 100_000:
+        return f"{val:,.0f}"
+    if val >= 1_000:
+        return f"{val:,.2f}"
+    if val >= 1:
+        return f"{val:.4f}"
+    return f"{val:.6f}"
+
+
+@lru_cache(maxsize=1024)
+def _format_price_cached(price_key: str) -> str:
+    """Compact price text; keyed on the raw string since most ticks repeat the same prices."""
+    try:
+        val = float(price_key)
+    except ValueError:
+        return _truncate_price_text(price_key)
+    return _format_price_num(val)
+
+
 class CurrencyCardWidget(ctk.CTkFrame):
     """Reusable currency card with fast update (no destroy/recreate)."""
 
@@ -1866,17 +2428,14 @@ class CurrencyCardWidget(ctk.CTkFrame):
         self._on_remove = on_remove
         self._show_remove = show_remove
 
-        self.font_getter = font_getter or (lambda size, bold=False: (config.FALLBACK_FONT, size, "bold") if bold else (config.FALLBACK_FONT, size))
+        self.font_getter = _memo_font_getter(font_getter or _default_font)
         self.rtl = rtl
+        self._set_direction(rtl)
 
         # Header row
         self.header = ctk.CTkFrame(self, fg_color="transparent")
         self.header.pack(fill="x", padx=16, pady=(14, 6))
 
-        badge_side = "right" if self.rtl else "left"
-        name_side = "right" if self.rtl else "left"
-        remove_side = "left" if self.rtl else "right"
-
         self.symbol_badge = ctk.CTkFrame(
             self.header,
             fg_color=(colors.accent_blue, colors.accent_blue),
@@ -1884,7 +2443,7 @@ class CurrencyCardWidget(ctk.CTkFrame):
             width=44,
             height=26,
         )
-        self.symbol_badge.pack(side=badge_side)
+        self.symbol_badge.pack(side=self._badge_side)
         self.symbol_badge.pack_propagate(False)
 
         self.symbol_label = ctk.CTkLabel(
@@ -1900,28 +2459,14 @@ class CurrencyCardWidget(ctk.CTkFrame):
             text="",
             font=self.font_getter(14, True),
             text_color=(colors.text_primary_light, colors.text_primary_dark),
-            anchor="e" if self.rtl else "w",
-            justify="right" if self.rtl else "left",
+            anchor=self._anchor,
+            justify=self._justify,
             wraplength=int(self._card_width * 0.62),
         )
-        self.name_label.pack(side=name_side, padx=(12, 8), fill="x", expand=True)
+        self.name_label.pack(side=self._badge_side, padx=(12, 8), fill="x", expand=True)
 
+        # Built on first need (see _ensure_remove_btn / _ensure_unit_label)
         self.remove_btn: Optional[ctk.CTkButton] = None
-        if self._show_remove:
-            self.remove_btn = ctk.CTkButton(
-                self.header,
-                text="✕",
-                width=32,
-                height=28,
-                corner_radius=10,
-                fg_color=(colors.separator_light, colors.separator_dark),
-                hover_color=(colors.accent_orange, colors.accent_orange),
-                text_color=(colors.text_primary_light, colors.text_primary_dark),
-                border_width=1,
-                border_color=(colors.border_light, colors.border_dark),
-                command=self._remove_clicked,
-            )
-            self.remove_btn.pack(side=remove_side)
 
         # Price
         self.price_section = ctk.CTkFrame(self, fg_color="transparent")
@@ -1932,33 +2477,33 @@ class CurrencyCardWidget(ctk.CTkFrame):
             text="—",
             font=self.font_getter(23, True),
             text_color=(colors.text_primary_light, colors.text_primary_dark),
-            anchor="e" if self.rtl else "w",
+            anchor=self._anchor,
         )
         self.price_label.pack(fill="x")
 
-        self.unit_label = ctk.CTkLabel(
-            self.price_section,
-            text="",
-            font=self.font_getter(11, False),
-            text_color=(colors.text_tertiary_light, colors.text_tertiary_dark),
-            anchor="e" if self.rtl else "w",
-            justify="right" if self.rtl else "left",
-        )
-        self.unit_label.pack(fill="x", pady=(2, 0))
+        self.unit_label: Optional[ctk.CTkLabel] = None
 
         # Change pill
-        self.change_pill = ctk.CTkFrame(self, corner_radius=12, height=28)
+        # Built directly in the neutral ("nan") style; the first update_data fills it in
+        pill_color, text_color = _change_style("nan")
+        self.change_pill = ctk.CTkFrame(self, corner_radius=12, height=28, fg_color=pill_color)
         self.change_pill.pack(fill="x", padx=16, pady=(6, 12))
         self.change_pill.pack_propagate(False)
 
         self.change_label = ctk.CTkLabel(
             self.change_pill,
-            text="",
+            text="—",
             font=self.font_getter(12, True),
+            text_color=text_color,
         )
         self.change_label.place(relx=0.5, rely=0.5, anchor="center")
 
-        self._set_change(None)
+        self._batch_depth = 0
+        self._pending_cfg: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+        self._change_bucket: Optional[str] = "nan"
+        self._change_key: Optional[Tuple[str, Optional[float]]] = None
+        # Raw values last rendered, so update_data only touches labels that changed
+        self._last: Dict[str, Any] = {"sym": "", "name": "", "unit": ""}
 
     def set_typography(
         self,
@@ -1967,82 +2512,200 @@ class CurrencyCardWidget(ctk.CTkFrame):
         rtl: Optional[bool] = None,
     ) -> None:
         if font_getter is not None:
-            self.font_getter = font_getter
-        if rtl is not None:
+            # Re-wrapping also drops tuples built for the previous font family
+            self.font_getter = _memo_font_getter(font_getter)
+        if rtl is not None and rtl != self.rtl:
             self.rtl = rtl
+            self._set_direction(rtl)
 
         try:
             self.symbol_label.configure(font=self.font_getter(10, True))
             self.name_label.configure(
                 font=self.font_getter(14, True),
-                anchor="e" if self.rtl else "w",
-                justify="right" if self.rtl else "left",
-            )
-            self.price_label.configure(font=self.font_getter(23, True), anchor="e" if self.rtl else "w")
-            self.unit_label.configure(
-                font=self.font_getter(11, False),
-                anchor="e" if self.rtl else "w",
-                justify="right" if self.rtl else "left",
+                anchor=self._anchor,
+                justify=self._justify,
             )
+            self.price_label.configure(font=self.font_getter(23, True), anchor=self._anchor)
+            if self.unit_label is not None:
+                self.unit_label.configure(
+                    font=self.font_getter(11, False),
+                    anchor=self._anchor,
+                    justify=self._justify,
+                )
             self.change_label.configure(font=self.font_getter(12, True))
         except Exception:
             pass
 
+    def _set_direction(self, rtl: bool) -> None:
+        """Derive the RTL-dependent anchor/justify/pack-side strings once per direction change."""
+        self._anchor = "e" if rtl else "w"
+        self._justify = "right" if rtl else "left"
+        self._badge_side = "right" if rtl else "left"
+        self._remove_side = "left" if rtl else "right"
+
+    def _ensure_remove_btn(self) -> None:
+        if self.remove_btn is not None or not self._show_remove:
+            return
+        self.remove_btn = ctk.CTkButton(
+            self.header,
+            text="✕",
+            width=32,
+            height=28,
+            corner_radius=10,
+            fg_color=(colors.separator_light, colors.separator_dark),
+            hover_color=(colors.accent_orange, colors.accent_orange),
+            text_color=(colors.text_primary_light, colors.text_primary_dark),
+            border_width=1,
+            border_color=(colors.border_light, colors.border_dark),
+            command=self._remove_clicked,
+        )
+        self.remove_btn.pack(side=self._remove_side)
+
+    def _ensure_unit_label(self) -> None:
+        if self.unit_label is not None:
+            return
+        self.unit_label = ctk.CTkLabel(
+            self.price_section,
+            text="",
+            font=self.font_getter(11, False),
+            text_color=(colors.text_tertiary_light, colors.text_tertiary_dark),
+            anchor=self._anchor,
+            justify=self._justify,
+        )
+        self.unit_label.pack(fill="x", pady=(2, 0))
+
     def _remove_clicked(self) -> None:
         if self._on_remove and self.symbol:
             self._on_remove(self.symbol)
 
     @staticmethod
     def _format_price(price: Any) -> str:
-        try:
-            val = float(price)
-            if val >= 1_000_000_000:
-                return f"{val/1_000_000_000:.2f}B"
-            if val >= 1_000_000:
-                return f"{val/1_000_000:.2f}M"
-            if val >= 100_000:
-                return f"{val:,.0f}"
-            if val >= 1_000:
-                return f"{val:,.2f}"
-            if val >= 1:
-                return f"{val:.4f}"
-            return f"{val:.6f}"
-        except Exception:
-            s = str(price)
-            return s[:12] + "…" if len(s) > 12 else s
+        # Type guards first: numbers skip parsing, None/"" skip the float() failure path
+        if isinstance(price, (int, float)):
+            return _format_price_num(float(price))
+        if price is None or price == "":
+            return str(price)
+        return _format_price_cached(str(price))
 
     def _set_change(self, change_percent: Any) -> None:
         try:
-            val = float(change_percent)
-            if val > 0:
-                self.change_pill.configure(fg_color=colors.accent_green)
-                self.change_label.configure(text=f"↗ +{val:.2f}%", text_color="white")
-            elif val < 0:
-                self.change_pill.configure(fg_color=colors.accent_red)
-                self.change_label.configure(text=f"↘ {val:.2f}%", text_color="white")
+            # Quantize to what is displayed so sub-0.01% jitter never reaches Tk
+            rounded = round(float(change_percent), 2)
+            bucket = "pos" if rounded > 0 else "neg" if rounded < 0 else "zero"
+        except Exception:
+            rounded, bucket = None, "nan"
+        key = (bucket, rounded)
+        if key == self._change_key:
+            return
+        self._change_key = key
+        text = "N/A" if rounded is None else _change_text(bucket, rounded)
+
+        if bucket == self._change_bucket:
+            self._cfg(self.change_label, text=text)
+            return
+        # The pill is only repainted when the bucket changes
+        pill_color, text_color = _change_style(bucket)
+        self._cfg(self.change_pill, fg_color=pill_color)
+        self._cfg(self.change_label, text=text, text_color=text_color)
+        self._change_bucket = bucket
+
+    _UNSET = object()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defer label/pill configure() calls and apply them once, merged per widget."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_cfg:
+                pending, self._pending_cfg = self._pending_cfg, {}
+                for widget, kw in pending.values():
+                    widget.configure(**kw)
+
+    def _cfg(self, widget: Any, **kw: Any) -> None:
+        if self._batch_depth:
+            entry = self._pending_cfg.get(id(widget))
+            if entry is None:
+                self._pending_cfg[id(widget)] = (widget, kw)
             else:
-                self.change_pill.configure(fg_color=(colors.separator_light, colors.separator_dark))
-                self.change_label.configure(text="0.00%", text_color=(colors.text_primary_light, colors.text_primary_dark))
+                entry[1].update(kw)
+        else:
+            widget.configure(**kw)
+
+    # Grid-wide coalescing: latest payload per card, applied in one idle callback
+    _queued: Dict[int, Tuple["CurrencyCardWidget", Dict[str, Any]]] = {}
+    _flush_scheduled = False
+
+    def queue_update(self, currency: Dict[str, Any]) -> None:
+        """Like update_data, but deferred to idle time; repeated calls before the flush keep the last payload."""
+        cls = CurrencyCardWidget
+        cls._queued[id(self)] = (self, currency)
+        if cls._flush_scheduled:
+            return
+        cls._flush_scheduled = True
+        try:
+            # On the toplevel, not this card: destroying the card would drop the callback
+            # and leave _flush_scheduled stuck, so no card would ever update again.
+            self.winfo_toplevel().after_idle(cls.flush_updates)
         except Exception:
-            self.change_pill.configure(fg_color=(colors.separator_light, colors.separator_dark))
-            self.change_label.configure(text="N/A", text_color=(colors.text_primary_light, colors.text_primary_dark))
+            cls.flush_updates()
+
+    def destroy(self) -> None:
+        CurrencyCardWidget._queued.pop(id(self), None)
+        super().destroy()
+
+    @classmethod
+    def flush_updates(cls) -> None:
+        cls._flush_scheduled = False
+        queued, cls._queued = cls._queued, {}
+        for card, currency in queued.values():
+            try:
+                if card.winfo_exists():
+                    card.update_data(currency)
+            except Exception:
+                pass
 
     def update_data(self, currency: Dict[str, Any]) -> None:
+        with self.batch():
+            self._update_data(currency)
+
+    def _update_data(self, currency: Dict[str, Any]) -> None:
+        last = self._last
+        unset = self._UNSET
+
         sym = str(currency.get("symbol", "")).upper().strip()
         self.symbol = sym
-
-        self.symbol_label.configure(text=sym[:4] if sym else "---")
+        if last.get("sym", unset) != sym:
+            self._cfg(self.symbol_label, text=sym[:4] if sym else "---")
+            last["sym"] = sym
+            if sym:
+                self._ensure_remove_btn()
 
         name = str(currency.get("name", sym or "Currency"))
-        # Keep the UI stable; allow longer names but avoid stretching the header too much
-        if len(name) > 36:
-            name = name[:33] + "…"
-        self.name_label.configure(text=name)
+        if last.get("name", unset) != name:
+            last["name"] = name
+            # Keep the UI stable; allow longer names but avoid stretching the header too much
+            self._cfg(self.name_label, text=name[:_NAME_CUT] + _NAME_ELLIPSIS if len(name) > _NAME_MAX else name)
+
+        price = currency.get("price", "0")
+        if last.get("price", unset) != price:
+            self._cfg(self.price_label, text=self._format_price(price))
+            last["price"] = price
 
-        self.price_label.configure(text=self._format_price(currency.get("price", "0")))
-        self.unit_label.configure(text=str(currency.get("unit", "")))
+        unit = str(currency.get("unit", ""))
+        if last.get("unit", unset) != unit:
+            if unit:
+                self._ensure_unit_label()
+            if self.unit_label is not None:
+                self._cfg(self.unit_label, text=unit)
+            last["unit"] = unit
 
-        self._set_change(currency.get("change_percent", None))
+        change = currency.get("change_percent", None)
+        if last.get("change", unset) != change:
+            self._set_change(change)
+            last["change"] = change
 
 
 
@@ -2051,7 +2714,14 @@ class CurrencyCardWidget(ctk.CTkFrame):
 # Desktop Widgets + History UI helpers
 # =============================================================================
 
-@dataclass
+# Read-only default for lookups on a missing mapping (never mutated)
+_EMPTY_DICT: Dict[str, Any] = {}
+
+# dataclass(slots=True) needs 3.10+; older interpreters keep the per-instance __dict__
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class DesktopWidgetConfig:
     widget_id: str
     widget_type: str = "price"  # price | movers | portfolio
@@ -2061,19 +2731,32 @@ class DesktopWidgetConfig:
     width: int = config.WIDGET_WIDTH
     height: int = config.WIDGET_HEIGHT
     opacity: float = config.WIDGET_DEFAULT_OPACITY
+    # Normalized, interned copies of widget_type/symbol for the render/update paths
+    _wtype: str = field(init=False, repr=False, compare=False, default="price")
+    _sym: str = field(init=False, repr=False, compare=False, default="")
+
+    def __post_init__(self) -> None:
+        self._wtype = sys.intern(str(self.widget_type or "price").lower().strip())
+        self._sym = sys.intern(str(self.symbol or "").upper().strip())
 
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> "DesktopWidgetConfig":
-        src = dict(d or {})
+        get = (d or _EMPTY_DICT).get
+        wid = get("widget_id")
+        wtype = get("widget_type")
+        sym = get("symbol")
+        # 0 (or negative, on multi-monitor setups) is a valid coordinate; only a missing one falls back
+        x = get("x")
+        y = get("y")
         return DesktopWidgetConfig(
-            widget_id=str(src.get("widget_id") or uuid.uuid4().hex[:10]),
-            widget_type=str(src.get("widget_type") or "price"),
-            symbol=str(src.get("symbol") or "USD").upper().strip(),
-            x=int(src.get("x") or 80),
-            y=int(src.get("y") or 80),
-            width=int(src.get("width") or config.WIDGET_WIDTH),
-            height=int(src.get("height") or config.WIDGET_HEIGHT),
-            opacity=float(src.get("opacity") or config.WIDGET_DEFAULT_OPACITY),
+            widget_id=str(wid) if wid else uuid.uuid4().hex[:10],
+            widget_type=str(wtype) if wtype else "price",
+            symbol=str(sym).upper().strip() if sym else "USD",
+            x=80 if x is None else int(x),
+            y=80 if y is None else int(y),
+            width=int(get("width") or config.WIDGET_WIDTH),
+            height=int(get("height") or config.WIDGET_HEIGHT),
+            opacity=float(get("opacity") or config.WIDGET_DEFAULT_OPACITY),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -2089,6 +2772,222 @@ class DesktopWidgetConfig:
         }
 
 
+class _POINT(ctypes.Structure):
+    _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
+
+
+class _NOTIFYICONDATAW(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", ctypes.c_uint),
+        ("hWnd", ctypes.c_void_p),
+        ("uID", ctypes.c_uint),
+        ("uFlags", ctypes.c_uint),
+        ("uCallbackMessage", ctypes.c_uint),
+        ("hIcon", ctypes.c_void_p),
+        ("szTip", ctypes.c_wchar * 128),
+    ]
+
+
+_SIZEOF_NID = ctypes.sizeof(_NOTIFYICONDATAW)
+# Reused by the tray's right-click handler (tray thread only)
+_CURSOR_POINT = _POINT()
+
+# Win32 type aliases resolved once at import; ctypes.wintypes itself is never patched
+# (wintypes lacks LRESULT, and on some builds HICON/HCURSOR)
+_PTR64 = ctypes.sizeof(ctypes.c_void_p) == 8
+_WPARAM_T = ctypes.c_uint64 if _PTR64 else ctypes.c_uint32
+_LPARAM_T = ctypes.c_int64 if _PTR64 else ctypes.c_int32
+_LRESULT_T = _LPARAM_T
+_wintypes: Any = None
+_HICON_T: Any = None
+_HCURSOR_T: Any = None
+if IS_WINDOWS:
+    from ctypes import wintypes as _wintypes
+
+    _HICON_T = getattr(_wintypes, "HICON", _wintypes.HANDLE)
+    _HCURSOR_T = getattr(_wintypes, "HCURSOR", _wintypes.HANDLE)
+
+
+def _load_winapi() -> Any:
+    """Resolve the Win32 entry points used below once, with argtypes/restype set.
+
+    Private WinDLL handles keep these prototypes from leaking into ``ctypes.windll``,
+    which other libraries share.
+    """
+    w = _wintypes
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    shell32 = ctypes.WinDLL("shell32", use_last_error=True)
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    wparam_t = _WPARAM_T
+    lparam_t = _LPARAM_T
+    lresult_t = _LRESULT_T
+
+    def fn(dll: Any, name: str, argtypes: List[Any], restype: Any) -> Any:
+        f = getattr(dll, name)
+        f.argtypes = argtypes
+        f.restype = restype
+        return f
+
+    api = SimpleNamespace(
+        WPARAM=wparam_t,
+        LPARAM=lparam_t,
+        LRESULT=lresult_t,
+        WNDPROC=ctypes.WINFUNCTYPE(lresult_t, w.HWND, w.UINT, wparam_t, lparam_t),
+        WNDENUMPROC=ctypes.WINFUNCTYPE(w.BOOL, w.HWND, lparam_t),
+        WINEVENTPROC=ctypes.WINFUNCTYPE(
+            None, w.HANDLE, w.DWORD, w.HWND, w.LONG, w.LONG, w.DWORD, w.DWORD
+        ),
+    )
+
+    class WNDCLASSW(ctypes.Structure):
+        _fields_ = [
+            ("style", w.UINT),
+            ("lpfnWndProc", api.WNDPROC),
+            ("cbClsExtra", ctypes.c_int),
+            ("cbWndExtra", ctypes.c_int),
+            ("hInstance", w.HINSTANCE),
+            ("hIcon", _HICON_T),
+            ("hCursor", _HCURSOR_T),
+            ("hbrBackground", w.HBRUSH),
+            ("lpszMenuName", w.LPCWSTR),
+            ("lpszClassName", w.LPCWSTR),
+        ]
+
+    api.WNDCLASSW = WNDCLASSW
+
+    api.FindWindowW = fn(user32, "FindWindowW", [w.LPCWSTR, w.LPCWSTR], w.HWND)
+    api.FindWindowExW = fn(user32, "FindWindowExW", [w.HWND, w.HWND, w.LPCWSTR, w.LPCWSTR], w.HWND)
+    api.SendMessageTimeoutW = fn(
+        user32, "SendMessageTimeoutW",
+        [w.HWND, w.UINT, wparam_t, lparam_t, w.UINT, w.UINT, ctypes.POINTER(ctypes.c_size_t)],
+        lresult_t,
+    )
+    api.EnumWindows = fn(user32, "EnumWindows", [api.WNDENUMPROC, lparam_t], w.BOOL)
+    api.GetForegroundWindow = fn(user32, "GetForegroundWindow", [], w.HWND)
+    api.GetShellWindow = fn(user32, "GetShellWindow", [], w.HWND)
+    api.GetClassNameW = fn(user32, "GetClassNameW", [w.HWND, w.LPWSTR, ctypes.c_int], ctypes.c_int)
+    api.SetParent = fn(user32, "SetParent", [w.HWND, w.HWND], w.HWND)
+    api.SetWindowPos = fn(
+        user32, "SetWindowPos",
+        [w.HWND, w.HWND, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, w.UINT],
+        w.BOOL,
+    )
+    api.GetWindowLongW = fn(user32, "GetWindowLongW", [w.HWND, ctypes.c_int], w.LONG)
+    api.SetWindowLongW = fn(user32, "SetWindowLongW", [w.HWND, ctypes.c_int, w.LONG], w.LONG)
+    api.DefWindowProcW = fn(user32, "DefWindowProcW", [w.HWND, w.UINT, wparam_t, lparam_t], lresult_t)
+    api.CreatePopupMenu = fn(user32, "CreatePopupMenu", [], w.HMENU)
+    api.AppendMenuW = fn(user32, "AppendMenuW", [w.HMENU, w.UINT, ctypes.c_size_t, w.LPCWSTR], w.BOOL)
+    api.TrackPopupMenu = fn(
+        user32, "TrackPopupMenu",
+        [w.HMENU, w.UINT, ctypes.c_int, ctypes.c_int, ctypes.c_int, w.HWND, ctypes.c_void_p],
+        w.UINT,
+    )
+    api.DestroyMenu = fn(user32, "DestroyMenu", [w.HMENU], w.BOOL)
+    api.GetCursorPos = fn(user32, "GetCursorPos", [ctypes.c_void_p], w.BOOL)
+    api.SetForegroundWindow = fn(user32, "SetForegroundWindow", [w.HWND], w.BOOL)
+    api.PostQuitMessage = fn(user32, "PostQuitMessage", [ctypes.c_int], None)
+    api.GetMessageW = fn(user32, "GetMessageW", [ctypes.c_void_p, w.HWND, w.UINT, w.UINT], w.BOOL)
+    api.PeekMessageW = fn(user32, "PeekMessageW", [ctypes.c_void_p, w.HWND, w.UINT, w.UINT, w.UINT], w.BOOL)
+    api.MsgWaitForMultipleObjectsEx = fn(
+        user32, "MsgWaitForMultipleObjectsEx",
+        [w.DWORD, ctypes.POINTER(w.HANDLE), w.DWORD, w.DWORD, w.DWORD],
+        w.DWORD,
+    )
+    api.TranslateMessage = fn(user32, "TranslateMessage", [ctypes.c_void_p], w.BOOL)
+    api.DispatchMessageW = fn(user32, "DispatchMessageW", [ctypes.c_void_p], lresult_t)
+    # lpIconName is usually MAKEINTRESOURCE(id), so it is typed as a plain pointer
+    api.LoadIconW = fn(user32, "LoadIconW", [w.HINSTANCE, ctypes.c_void_p], w.HANDLE)
+    api.CreateWindowExW = fn(
+        user32, "CreateWindowExW",
+        [w.DWORD, w.LPCWSTR, w.LPCWSTR, w.DWORD, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+         w.HWND, w.HMENU, w.HINSTANCE, ctypes.c_void_p],
+        w.HWND,
+    )
+    api.RegisterClassW = fn(user32, "RegisterClassW", [ctypes.c_void_p], w.ATOM)
+    api.DestroyWindow = fn(user32, "DestroyWindow", [w.HWND], w.BOOL)
+    api.UnregisterClassW = fn(user32, "UnregisterClassW", [w.LPCWSTR, w.HINSTANCE], w.BOOL)
+    api.PostMessageW = fn(user32, "PostMessageW", [w.HWND, w.UINT, wparam_t, lparam_t], w.BOOL)
+    api.IsWindow = fn(user32, "IsWindow", [w.HWND], w.BOOL)
+    api.RegisterWindowMessageW = fn(user32, "RegisterWindowMessageW", [w.LPCWSTR], w.UINT)
+    api.SetWinEventHook = fn(
+        user32, "SetWinEventHook",
+        [w.DWORD, w.DWORD, w.HMODULE, api.WINEVENTPROC, w.DWORD, w.DWORD, w.DWORD],
+        w.HANDLE,
+    )
+    api.UnhookWinEvent = fn(user32, "UnhookWinEvent", [w.HANDLE], w.BOOL)
+    api.Shell_NotifyIconW = fn(shell32, "Shell_NotifyIconW", [w.DWORD, ctypes.c_void_p], w.BOOL)
+    api.GetModuleHandleW = fn(kernel32, "GetModuleHandleW", [w.LPCWSTR], w.HMODULE)
+    api.CreateEventW = fn(kernel32, "CreateEventW", [ctypes.c_void_p, w.BOOL, w.BOOL, w.LPCWSTR], w.HANDLE)
+    api.SetEvent = fn(kernel32, "SetEvent", [w.HANDLE], w.BOOL)
+    api.CloseHandle = fn(kernel32, "CloseHandle", [w.HANDLE], w.BOOL)
+    return api
+
+
+def _enum_find_workerw(hwnd: Optional[int], lparam: int) -> bool:
+    """EnumWindows callback: store the WorkerW behind the desktop icons into *lparam (a c_void_p)."""
+    if _WINAPI.FindWindowExW(hwnd, 0, "SHELLDLL_DefView", None):
+        w = _WINAPI.FindWindowExW(0, hwnd, "WorkerW", None)
+        if w:
+            ctypes.cast(lparam, ctypes.POINTER(ctypes.c_void_p))[0] = w
+    return True
+
+
+# Desktop WorkerW hwnd; stable until Explorer restarts ("TaskbarCreated" clears it)
+_WORKERW_CACHE: Optional[int] = None
+_WORKERW_LOCK = threading.Lock()
+
+# Last foreground hwnd -> "is desktop" verdict, plus a reusable class-name buffer
+_FG_CACHE: Tuple[int, bool] = (0, False)
+_FG_LOCK = threading.Lock()
+_CLSBUF = ctypes.create_unicode_buffer(64)
+
+# Tray hwnd -> WinTrayIcon, so one module-level window procedure serves every tray
+_TRAY_WINDOWS: Dict[int, Any] = {}
+
+
+def _tray_wndproc(hwnd: Optional[int], msg: int, wparam: int, lparam: int) -> int:
+    tray = _TRAY_WINDOWS.get(hwnd) if hwnd else None
+    if tray is not None:
+        try:
+            res = tray._on_message(hwnd, msg, wparam, lparam)
+        except Exception:
+            res = None
+        if res is not None:
+            return res
+    return _WINAPI.DefWindowProcW(hwnd, msg, wparam, lparam)
+
+
+# WinEvent hook handle -> WinTrayIcon, for the shared foreground-hook trampoline
+_TRAY_HOOKS: Dict[int, Any] = {}
+
+
+def _on_foreground_event(hook: Optional[int], event: int, hwnd: Optional[int], id_object: int,
+                         id_child: int, thread_id: int, time_ms: int) -> None:
+    tray = _TRAY_HOOKS.get(hook) if hook else None
+    if tray is not None:
+        try:
+            tray._on_foreground()
+        except Exception:
+            pass
+
+
+_WINAPI: Any = None
+# One callback trampoline each for the whole session instead of one per lookup/thread
+_ENUM_FIND_WORKERW: Any = None
+_TRAY_WNDPROC: Any = None
+_FOREGROUND_HOOK_PROC: Any = None
+if IS_WINDOWS:
+    try:
+        _WINAPI = _load_winapi()
+        _ENUM_FIND_WORKERW = _WINAPI.WNDENUMPROC(_enum_find_workerw)
+        _TRAY_WNDPROC = _WINAPI.WNDPROC(_tray_wndproc)
+        _FOREGROUND_HOOK_PROC = _WINAPI.WINEVENTPROC(_on_foreground_event)
+    except Exception as e:
+        logger.debug(f"Win32 API setup failed: {e}")
+
+
 class DesktopWindowHelper:
     """Windows-only helper to pin a Tk window to the desktop (behind all apps)."""
 
@@ -2098,18 +2997,42 @@ class DesktopWindowHelper:
 
     @staticmethod
     def _get_workerw() -> Optional[int]:
-        if not IS_WINDOWS:
+        global _WORKERW_CACHE
+        api = _WINAPI
+        if api is None:
+            return None
+        with _WORKERW_LOCK:
+            cached = _WORKERW_CACHE
+        try:
+            if cached and api.IsWindow(cached):
+                return cached
+        except Exception:
+            pass
+        found = DesktopWindowHelper._find_workerw()
+        with _WORKERW_LOCK:
+            _WORKERW_CACHE = found
+        return found
+
+    @staticmethod
+    def invalidate_workerw() -> None:
+        global _WORKERW_CACHE
+        with _WORKERW_LOCK:
+            _WORKERW_CACHE = None
+
+    @staticmethod
+    def _find_workerw() -> Optional[int]:
+        api = _WINAPI
+        if api is None:
             return None
 
         try:
-            user32 = ctypes.windll.user32
-            progman = user32.FindWindowW("Progman", None)
+            progman = api.FindWindowW("Progman", None)
             if not progman:
                 return None
 
             # Ask Progman to spawn a WorkerW behind the desktop icons
-            result = ctypes.c_ulong()
-            user32.SendMessageTimeoutW(
+            result = ctypes.c_size_t()
+            api.SendMessageTimeoutW(
                 progman,
                 0x052C,
                 0,
@@ -2119,23 +3042,11 @@ class DesktopWindowHelper:
                 ctypes.byref(result),
             )
 
+            # The shared callback writes the WorkerW behind the icons into `workerw`
             workerw = ctypes.c_void_p()
+            api.EnumWindows(_ENUM_FIND_WORKERW, ctypes.addressof(workerw))
 
-            def enum_proc(hwnd, lparam):
-                nonlocal workerw
-                shell = user32.FindWindowExW(hwnd, 0, "SHELLDLL_DefView", None)
-                if shell:
-                    # Get the WorkerW behind the icons
-                    w = user32.FindWindowExW(0, hwnd, "WorkerW", None)
-                    if w:
-                        workerw = ctypes.c_void_p(w)
-                return True
-
-            # EnumWindows callback
-            cb_type = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
-            user32.EnumWindows(cb_type(enum_proc), 0)
-
-            if workerw and workerw.value:
+            if workerw.value:
                 return int(workerw.value)
             return int(progman)
         except Exception:
@@ -2143,81 +3054,91 @@ class DesktopWindowHelper:
 
     @staticmethod
     def _set_toolwindow(hwnd: int) -> None:
-        if not IS_WINDOWS:
+        api = _WINAPI
+        if api is None:
             return
         try:
-            user32 = ctypes.windll.user32
             GWL_EXSTYLE = -20
             WS_EX_TOOLWINDOW = 0x00000080
             WS_EX_APPWINDOW = 0x00040000
             WS_EX_NOACTIVATE = 0x08000000
 
-            ex = user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
+            ex = api.GetWindowLongW(hwnd, GWL_EXSTYLE)
             ex = ex | WS_EX_TOOLWINDOW | WS_EX_NOACTIVATE
             ex = ex & ~WS_EX_APPWINDOW
-            user32.SetWindowLongW(hwnd, GWL_EXSTYLE, ex)
+            api.SetWindowLongW(hwnd, GWL_EXSTYLE, ex)
         except Exception:
             pass
 
     @staticmethod
     def _send_to_bottom(hwnd: int) -> None:
-        if not IS_WINDOWS:
+        api = _WINAPI
+        if api is None:
             return
         try:
-            user32 = ctypes.windll.user32
             HWND_BOTTOM = 1
             SWP_NOMOVE = 0x0002
             SWP_NOSIZE = 0x0001
             SWP_NOACTIVATE = 0x0010
             SWP_SHOWWINDOW = 0x0040
-            user32.SetWindowPos(hwnd, HWND_BOTTOM, 0, 0, 0, 0, SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE | SWP_SHOWWINDOW)
+            api.SetWindowPos(hwnd, HWND_BOTTOM, 0, 0, 0, 0, SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE | SWP_SHOWWINDOW)
         except Exception:
             pass
 
     @staticmethod
     def attach_to_desktop(hwnd: int) -> bool:
         """Re-parent the window to the desktop worker window and keep it behind other apps."""
-        if not IS_WINDOWS:
+        api = _WINAPI
+        if api is None:
             return False
         try:
-            user32 = ctypes.windll.user32
             parent = DesktopWindowHelper._get_workerw()
             if not parent:
                 return False
             DesktopWindowHelper._set_toolwindow(hwnd)
-            user32.SetParent(hwnd, int(parent))
+            api.SetParent(hwnd, int(parent))
             DesktopWindowHelper._send_to_bottom(hwnd)
             return True
         except Exception:
             return False
 
 
+    _DESKTOP_CLASSES = frozenset({"Progman", "WorkerW", "Shell_TrayWnd", "Shell_SecondaryTrayWnd"})
+
     @staticmethod
     def is_desktop_foreground() -> bool:
         """Return True if foreground window is desktop (Progman/WorkerW/taskbar). Windows-only."""
-        if not IS_WINDOWS:
+        global _FG_CACHE
+        api = _WINAPI
+        if api is None:
             return True
         try:
-            import ctypes
-            from ctypes import wintypes
-            user32 = ctypes.windll.user32
-
-            hwnd = user32.GetForegroundWindow()
+            hwnd = api.GetForegroundWindow()
             if not hwnd:
                 return True
+            hwnd = int(hwnd)
+            # The foreground window rarely changes between checks
+            cached_hwnd, cached = _FG_CACHE
+            if hwnd == cached_hwnd:
+                return cached
 
+            result = False
             try:
-                shell_hwnd = user32.GetShellWindow()
-                if shell_hwnd and int(hwnd) == int(shell_hwnd):
-                    return True
+                shell_hwnd = api.GetShellWindow()
+                if shell_hwnd and hwnd == int(shell_hwnd):
+                    result = True
             except Exception:
                 pass
 
-            buf = ctypes.create_unicode_buffer(256)
-            user32.GetClassNameW(wintypes.HWND(hwnd), buf, 256)
-            cls = (buf.value or "").strip()
+            if not result:
+                with _FG_LOCK:
+                    _CLSBUF[0] = "\0"
+                    api.GetClassNameW(hwnd, _CLSBUF, len(_CLSBUF))
+                    cls = _CLSBUF.value.strip()
+                result = cls in DesktopWindowHelper._DESKTOP_CLASSES
 
-            return cls in {"Progman", "WorkerW", "Shell_TrayWnd", "Shell_SecondaryTrayWnd"}
+            _FG_CACHE = (hwnd, result)
+            return result
         except Exception:
             return True
 
@@ -2225,13 +3146,38 @@ class DesktopWindowHelper:
 class WinTrayIcon:
     """Minimal Windows tray icon (no external dependencies)."""
 
+    _WM_DESTROY = 0x0002
+    _WM_COMMAND = 0x0111
+    _WM_RBUTTONUP = 0x0205
+    _WM_LBUTTONDBLCLK = 0x0203
+
+    _IDM_SHOW = 1001
+    _IDM_EXIT = 1002
+    _MENU_LABELS = {
+        "fa": ("باز کردن", "خروج"),
+        "en": ("Open", "Exit"),
+    }
+
     def __init__(self, app: Any):
         self.app = app
         self._thread: Optional[threading.Thread] = None
         self._hwnd: Optional[int] = None
         self._running = False
         self._msg_id = 0x400 + 91
+        self._wm_taskbarcreated = -1
         self._icon_added = False
+        # One NOTIFYICONDATAW buffer reused for every add/remove
+        self._nid = _NOTIFYICONDATAW()
+        self._nid.cbSize = _SIZEOF_NID
+        self._nid.uID = 1
+        # Foreground-change hook (replaces per-widget polling while installed)
+        self._fg_hook: Optional[int] = None
+        self._fg_last: Optional[bool] = None
+        # Auto-reset event the message pump waits on next to its input queue
+        self._wake: Optional[int] = None
+        # Context menu, rebuilt only when the UI language changes (tray thread only)
+        self._menu_hmenu: Optional[int] = None
+        self._menu_lang: Optional[str] = None
 
     def start(self) -> None:
         if not IS_WINDOWS:
@@ -2247,8 +3193,17 @@ class WinTrayIcon:
             return
         self._running = False
         try:
-            if self._hwnd:
-                ctypes.windll.user32.PostMessageW(int(self._hwnd), 0x0010, 0, 0)  # WM_CLOSE
+            if self._hwnd and _WINAPI is not None:
+                _WINAPI.PostMessageW(int(self._hwnd), 0x0010, 0, 0)  # WM_CLOSE
+        except Exception:
+            pass
+        self.wake()
+
+    def wake(self) -> None:
+        """Wake the tray thread's pump so it re-checks its state (thread-safe)."""
+        try:
+            if self._wake and _WINAPI is not None:
+                _WINAPI.SetEvent(self._wake)
         except Exception:
             pass
 
@@ -2259,177 +3214,223 @@ class WinTrayIcon:
         self._remove_icon()
 
     def _run_loop(self) -> None:
-        if not IS_WINDOWS:
+        api = _WINAPI
+        if api is None or _TRAY_WNDPROC is None:
             return
 
-        user32 = ctypes.windll.user32
-        kernel32 = ctypes.windll.kernel32
-
-        # Set WinAPI signatures (prevents 64-bit overflow issues in callbacks)
+        # Broadcast to top-level windows whenever Explorer (re)starts
         try:
-            from ctypes import wintypes as _w
-            if not hasattr(_w, "LRESULT"):
-                _w.LRESULT = ctypes.c_longlong if ctypes.sizeof(ctypes.c_void_p) == 8 else ctypes.c_long
-
-            PTR_SIZE = ctypes.sizeof(ctypes.c_void_p)
-            WPARAM_T = ctypes.c_uint64 if PTR_SIZE == 8 else ctypes.c_uint32
-            LPARAM_T = ctypes.c_int64 if PTR_SIZE == 8 else ctypes.c_int32
-            LRESULT_T = ctypes.c_int64 if PTR_SIZE == 8 else ctypes.c_int32
-
-            user32.DefWindowProcW.argtypes = [_w.HWND, _w.UINT, WPARAM_T, LPARAM_T]
-            user32.DefWindowProcW.restype = LRESULT_T
+            self._wm_taskbarcreated = int(api.RegisterWindowMessageW("TaskbarCreated")) or -1
+        except Exception:
+            self._wm_taskbarcreated = -1
 
-            user32.CreatePopupMenu.argtypes = []
-            user32.CreatePopupMenu.restype = _w.HMENU
+        hinst = api.GetModuleHandleW(None)
+        cls_name = f"LiquidGheymatTray_{os.getpid()}"
 
-            user32.AppendMenuW.argtypes = [_w.HMENU, _w.UINT, _w.UINT_PTR, _w.LPCWSTR]
-            user32.AppendMenuW.restype = _w.BOOL
+        wc = api.WNDCLASSW()
+        wc.style = 0
+        wc.lpfnWndProc = _TRAY_WNDPROC
+        wc.cbClsExtra = 0
+        wc.cbWndExtra = 0
+        wc.hInstance = hinst
+        wc.hIcon = api.LoadIconW(None, 32512)  # IDI_APPLICATION
+        wc.hCursor = None
+        wc.hbrBackground = None
+        wc.lpszMenuName = None
+        wc.lpszClassName = cls_name
 
-            user32.TrackPopupMenu.argtypes = [_w.HMENU, _w.UINT, _w.INT, _w.INT, _w.INT, _w.HWND, _w.LPCRECT]
-            user32.TrackPopupMenu.restype = _w.UINT
+        try:
+            api.RegisterClassW(ctypes.byref(wc))
+        except Exception:
+            pass
 
-            user32.DestroyMenu.argtypes = [_w.HMENU]
-            user32.DestroyMenu.restype = _w.BOOL
+        hwnd = api.CreateWindowExW(0, cls_name, cls_name, 0, 0, 0, 0, 0, 0, 0, hinst, None)
+        self._hwnd = int(hwnd) if hwnd else None
+        if self._hwnd:
+            _TRAY_WINDOWS[self._hwnd] = self
 
-            user32.GetCursorPos.argtypes = [ctypes.c_void_p]
-            user32.GetCursorPos.restype = _w.BOOL
+        # Out-of-context hooks are delivered through this thread's message loop
+        self._install_foreground_hook()
 
-            user32.SetForegroundWindow.argtypes = [_w.HWND]
-            user32.SetForegroundWindow.restype = _w.BOOL
+        try:
+            self._wake = int(api.CreateEventW(None, False, False, None) or 0) or None
+        except Exception:
+            self._wake = None
 
-            user32.PostQuitMessage.argtypes = [ctypes.c_int]
-            user32.PostQuitMessage.restype = None
+        if self._wake:
+            self._pump_messages(api)
+        else:
+            msg = _wintypes.MSG()
+            while self._running and api.GetMessageW(ctypes.byref(msg), 0, 0, 0) != 0:
+                api.TranslateMessage(ctypes.byref(msg))
+                api.DispatchMessageW(ctypes.byref(msg))
+
+        self._remove_foreground_hook()
+        wake, self._wake = self._wake, None
+        if wake:
+            try:
+                api.CloseHandle(wake)
+            except Exception:
+                pass
+        try:
+            if hwnd:
+                api.DestroyWindow(hwnd)
+        except Exception:
+            pass
+        if self._hwnd:
+            _TRAY_WINDOWS.pop(self._hwnd, None)
+        try:
+            api.UnregisterClassW(cls_name, hinst)
         except Exception:
             pass
-        from ctypes import wintypes
-
-        # Compatibility: some Python/Windows builds omit these aliases in ctypes.wintypes
-        if not hasattr(wintypes, "HCURSOR"):
-            wintypes.HCURSOR = wintypes.HANDLE
-        if not hasattr(wintypes, "HICON"):
-            wintypes.HICON = wintypes.HANDLE
-        if not hasattr(wintypes, "LRESULT"):
-            wintypes.LRESULT = ctypes.c_longlong if ctypes.sizeof(ctypes.c_void_p) == 8 else ctypes.c_long
-
-        class POINT(ctypes.Structure):
-            _fields_ = [("x", ctypes.c_long), ("y", ctypes.c_long)]
-
-        WM_DESTROY = 0x0002
-        WM_COMMAND = 0x0111
-        WM_RBUTTONUP = 0x0205
-        WM_LBUTTONDBLCLK = 0x0203
 
-        IDM_SHOW = 1001
-        IDM_EXIT = 1002
+    def _on_message(self, hwnd: int, msg: int, wparam: int, lparam: int) -> Optional[int]:
+        """Handle a tray window message; None falls through to DefWindowProcW."""
+        api = _WINAPI
+        if msg == self._wm_taskbarcreated:
+            DesktopWindowHelper.invalidate_workerw()
 
-        PTR_SIZE = ctypes.sizeof(ctypes.c_void_p)
-        WPARAM_T = ctypes.c_uint64 if PTR_SIZE == 8 else ctypes.c_uint32
-        LPARAM_T = ctypes.c_int64 if PTR_SIZE == 8 else ctypes.c_int32
-        LRESULT_T = ctypes.c_int64 if PTR_SIZE == 8 else ctypes.c_int32
+        if msg == self._msg_id:
+            lp = int(lparam) if lparam else 0
+            if lp == self._WM_LBUTTONDBLCLK:
+                try:
+                    self.app._enqueue_ui(self.app._show_from_tray)
+                except Exception:
+                    pass
+                return 0
 
-        WNDPROCTYPE = ctypes.WINFUNCTYPE(LRESULT_T, wintypes.HWND, wintypes.UINT, WPARAM_T, LPARAM_T)
+            if lp == self._WM_RBUTTONUP:
+                try:
+                    menu = self._ensure_menu(getattr(self.app, "language", "fa"))
 
-        @WNDPROCTYPE
-        def wndproc(hwnd, msg, wparam, lparam):
-            try:
-                if msg == self._msg_id:
-                    lp = int(lparam) if lparam else 0
-                    if lp == WM_LBUTTONDBLCLK:
-                        try:
-                            self.app._enqueue_ui(self.app._show_from_tray)
-                        except Exception:
-                            pass
-                        return 0
+                    pt = _CURSOR_POINT
+                    api.GetCursorPos(ctypes.byref(pt))
+                    api.SetForegroundWindow(hwnd)
+                    cmd = api.TrackPopupMenu(menu, 0x0100 | 0x0002, pt.x, pt.y, 0, hwnd, None)
 
-                    if lp == WM_RBUTTONUP:
-                        try:
-                            menu = user32.CreatePopupMenu()
-                            show_label = "باز کردن" if getattr(self.app, "language", "fa") == "fa" else "Open"
-                            exit_label = "خروج" if getattr(self.app, "language", "fa") == "fa" else "Exit"
-                            user32.AppendMenuW(menu, 0, IDM_SHOW, show_label)
-                            user32.AppendMenuW(menu, 0, IDM_EXIT, exit_label)
-
-                            pt = POINT()
-                            user32.GetCursorPos(ctypes.byref(pt))
-                            user32.SetForegroundWindow(hwnd)
-                            cmd = user32.TrackPopupMenu(menu, 0x0100 | 0x0002, pt.x, pt.y, 0, hwnd, None)
-                            user32.DestroyMenu(menu)
-
-                            if cmd == IDM_SHOW:
-                                self.app._enqueue_ui(self.app._show_from_tray)
-                            elif cmd == IDM_EXIT:
-                                self.app._enqueue_ui(self.app._exit_from_tray)
-                        except Exception:
-                            pass
-                        return 0
+                    if cmd == self._IDM_SHOW:
+                        self.app._enqueue_ui(self.app._show_from_tray)
+                    elif cmd == self._IDM_EXIT:
+                        self.app._enqueue_ui(self.app._exit_from_tray)
+                except Exception:
+                    pass
+                return 0
 
-                if msg == WM_COMMAND:
-                    return 0
+        if msg == self._WM_COMMAND:
+            return 0
 
-                if msg == WM_DESTROY:
-                    try:
-                        self._remove_icon()
-                    except Exception:
-                        pass
-                    try:
-                        user32.PostQuitMessage(0)
-                    except Exception:
-                        pass
-                    return 0
+        if msg == self._WM_DESTROY:
+            try:
+                self._remove_icon()
             except Exception:
                 pass
+            self._destroy_menu()
+            try:
+                api.PostQuitMessage(0)
+            except Exception:
+                pass
+            return 0
+        return None
 
-            return user32.DefWindowProcW(hwnd, msg, wparam, lparam)
-
-        hinst = kernel32.GetModuleHandleW(None)
-        cls_name = f"LiquidGheymatTray_{os.getpid()}"
+    def _ensure_menu(self, lang: str) -> Optional[int]:
+        """Return the cached popup menu, rebuilding it if the language changed."""
+        lang = "fa" if lang == "fa" else "en"
+        if self._menu_hmenu and lang == self._menu_lang:
+            return self._menu_hmenu
+        api = _WINAPI
+        self._destroy_menu()
+        menu = api.CreatePopupMenu()
+        if not menu:
+            return None
+        show_label, exit_label = self._MENU_LABELS[lang]
+        api.AppendMenuW(menu, 0, self._IDM_SHOW, show_label)
+        api.AppendMenuW(menu, 0, self._IDM_EXIT, exit_label)
+        self._menu_hmenu = int(menu)
+        self._menu_lang = lang
+        return self._menu_hmenu
+
+    def _destroy_menu(self) -> None:
+        menu, self._menu_hmenu = self._menu_hmenu, None
+        self._menu_lang = None
+        if menu and _WINAPI is not None:
+            try:
+                _WINAPI.DestroyMenu(menu)
+            except Exception:
+                pass
 
-        class WNDCLASSW(ctypes.Structure):
-            _fields_ = [
-                ("style", wintypes.UINT),
-                ("lpfnWndProc", WNDPROCTYPE),
-                ("cbClsExtra", ctypes.c_int),
-                ("cbWndExtra", ctypes.c_int),
-                ("hInstance", wintypes.HINSTANCE),
-                ("hIcon", wintypes.HICON),
-                ("hCursor", wintypes.HCURSOR),
-                ("hbrBackground", wintypes.HBRUSH),
-                ("lpszMenuName", wintypes.LPCWSTR),
-                ("lpszClassName", wintypes.LPCWSTR),
-            ]
+    def _pump_messages(self, api: Any) -> None:
+        """Sleep in the kernel until input or wake() arrives, then drain the queue."""
+        INFINITE = 0xFFFFFFFF
+        QS_ALLINPUT = 0x04FF
+        MWMO_INPUTAVAILABLE = 0x0004
+        WAIT_OBJECT_0 = 0x00000000
+        PM_REMOVE = 0x0001
+        WM_QUIT = 0x0012
+
+        handles = (_wintypes.HANDLE * 1)(self._wake)
+        msg = _wintypes.MSG()
+        pmsg = ctypes.byref(msg)
+        while self._running:
+            res = api.MsgWaitForMultipleObjectsEx(1, handles, INFINITE, QS_ALLINPUT, MWMO_INPUTAVAILABLE)
+            if res == WAIT_OBJECT_0:
+                continue  # wake(): loop condition re-checks _running
+            if res != WAIT_OBJECT_0 + 1:
+                return  # WAIT_FAILED
+            while api.PeekMessageW(pmsg, 0, 0, 0, PM_REMOVE):
+                if msg.message == WM_QUIT:
+                    return
+                api.TranslateMessage(pmsg)
+                api.DispatchMessageW(pmsg)
 
-        wc = WNDCLASSW()
-        wc.style = 0
-        wc.lpfnWndProc = wndproc
-        wc.cbClsExtra = 0
-        wc.cbWndExtra = 0
-        wc.hInstance = hinst
-        wc.hIcon = user32.LoadIconW(None, 32512)  # IDI_APPLICATION
-        wc.hCursor = None
-        wc.hbrBackground = None
-        wc.lpszMenuName = None
-        wc.lpszClassName = cls_name
+    def _install_foreground_hook(self) -> None:
+        api = _WINAPI
+        if api is None or _FOREGROUND_HOOK_PROC is None or self._fg_hook:
+            return
+        EVENT_SYSTEM_FOREGROUND = 0x0003
+        WINEVENT_OUTOFCONTEXT = 0x0000
 
         try:
-            user32.RegisterClassW(ctypes.byref(wc))
+            hook = api.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, None, _FOREGROUND_HOOK_PROC, 0, 0, WINEVENT_OUTOFCONTEXT
+            )
         except Exception:
-            pass
-
-        hwnd = user32.CreateWindowExW(0, cls_name, cls_name, 0, 0, 0, 0, 0, 0, 0, hinst, None)
-        self._hwnd = int(hwnd) if hwnd else None
-
-        msg = wintypes.MSG()
-        while self._running and user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) != 0:
-            user32.TranslateMessage(ctypes.byref(msg))
-            user32.DispatchMessageW(ctypes.byref(msg))
-
+            hook = None
+        if not hook:
+            return
+        # Out-of-context events are only dispatched from this thread's pump, after this returns
+        self._fg_hook = int(hook)
+        _TRAY_HOOKS[self._fg_hook] = self
+        self._fg_last = DesktopWindowHelper.is_desktop_foreground()
+        initial = self._fg_last
+        self._notify_widgets(lambda m: m.set_foreground_events(True, initial))
+
+    def _on_foreground(self) -> None:
+        on_desktop = DesktopWindowHelper.is_desktop_foreground()
+        if on_desktop != self._fg_last:
+            self._fg_last = on_desktop
+            self._notify_widgets(lambda m: m.set_desktop_foreground(on_desktop))
+
+    def _remove_foreground_hook(self) -> None:
+        if not self._fg_hook or _WINAPI is None:
+            return
         try:
-            if hwnd:
-                user32.DestroyWindow(hwnd)
+            _WINAPI.UnhookWinEvent(self._fg_hook)
         except Exception:
             pass
+        _TRAY_HOOKS.pop(self._fg_hook, None)
+        self._fg_hook = None
+        # Widgets fall back to polling
+        self._notify_widgets(lambda m: m.set_foreground_events(False, None))
+
+    def _notify_widgets(self, fn: Callable[[Any], None]) -> None:
+        """Run fn(widget_manager) on the UI thread."""
+        def task() -> None:
+            mgr = getattr(self.app, "widget_manager", None)
+            if mgr is not None:
+                fn(mgr)
+
         try:
-            user32.UnregisterClassW(cls_name, hinst)
+            self.app._enqueue_ui(task)
         except Exception:
             pass
 
@@ -2442,32 +3443,21 @@ class WinTrayIcon:
         if not hwnd:
             return
 
-        shell32 = ctypes.windll.shell32
-        user32 = ctypes.windll.user32
-
-        class NOTIFYICONDATAW(ctypes.Structure):
-            _fields_ = [
-                ("cbSize", ctypes.c_uint),
-                ("hWnd", ctypes.c_void_p),
-                ("uID", ctypes.c_uint),
-                ("uFlags", ctypes.c_uint),
-                ("uCallbackMessage", ctypes.c_uint),
-                ("hIcon", ctypes.c_void_p),
-                ("szTip", ctypes.c_wchar * 128),
-            ]
+        api = _WINAPI
+        if api is None:
+            return
 
         NIM_ADD = 0x00000000
         NIF_MESSAGE = 0x00000001
         NIF_ICON = 0x00000002
         NIF_TIP = 0x00000004
 
-        nid = NOTIFYICONDATAW()
-        nid.cbSize = ctypes.sizeof(NOTIFYICONDATAW)
-        nid.hWnd = ctypes.c_void_p(int(hwnd))
-        nid.uID = 1
+        nid = self._nid
+        nid.hWnd = int(hwnd)
         nid.uFlags = NIF_MESSAGE | NIF_ICON | NIF_TIP
         nid.uCallbackMessage = self._msg_id
-        nid.hIcon = user32.LoadIconW(None, 32512)
+        if not nid.hIcon:
+            nid.hIcon = api.LoadIconW(None, 32512)
 
         tip = "Liquid Gheymat"
         try:
@@ -2476,7 +3466,7 @@ class WinTrayIcon:
             pass
         nid.szTip = tip[:127]
 
-        shell32.Shell_NotifyIconW(NIM_ADD, ctypes.byref(nid))
+        api.Shell_NotifyIconW(NIM_ADD, ctypes.byref(nid))
         self._icon_added = True
 
     def _remove_icon(self) -> None:
@@ -2488,27 +3478,17 @@ class WinTrayIcon:
         if not hwnd:
             return
 
-        shell32 = ctypes.windll.shell32
-
-        class NOTIFYICONDATAW(ctypes.Structure):
-            _fields_ = [
-                ("cbSize", ctypes.c_uint),
-                ("hWnd", ctypes.c_void_p),
-                ("uID", ctypes.c_uint),
-                ("uFlags", ctypes.c_uint),
-                ("uCallbackMessage", ctypes.c_uint),
-                ("hIcon", ctypes.c_void_p),
-                ("szTip", ctypes.c_wchar * 128),
-            ]
+        api = _WINAPI
+        if api is None:
+            return
 
         NIM_DELETE = 0x00000002
 
-        nid = NOTIFYICONDATAW()
-        nid.cbSize = ctypes.sizeof(NOTIFYICONDATAW)
-        nid.hWnd = ctypes.c_void_p(int(hwnd))
-        nid.uID = 1
+        # NIM_DELETE only reads hWnd + uID; the rest of the buffer is ignored
+        nid = self._nid
+        nid.hWnd = int(hwnd)
 
-        shell32.Shell_NotifyIconW(NIM_DELETE, ctypes.byref(nid))
+        api.Shell_NotifyIconW(NIM_DELETE, ctypes.byref(nid))
         self._icon_added = False
 
 class SparklineCanvas(tk.Canvas):
@@ -2521,6 +3501,8 @@ class SparklineCanvas(tk.Canvas):
         self._width = int(width)
         self._height = int(height)
         self._last_mode = None
+        self._xs_key: Optional[Tuple[int, int, int]] = None
+        self._xs_cache: List[float] = []
 
     def _bg(self) -> str:
         mode = str(ctk.get_appearance_mode() or "").lower()
@@ -2558,18 +3540,20 @@ class SparklineCanvas(tk.Canvas):
         inner_w = max(10, w - 2 * pad)
         inner_h = max(10, h - 2 * pad)
 
-        points = []
+        # Column-wise transform: x positions depend only on (n, width), so reuse them
         n = len(vals)
-        for i, v in enumerate(vals):
-            x = pad + (i / (n - 1)) * inner_w
-            # higher value -> higher on chart
-            y = pad + (1.0 - (v - mn) / (mx - mn)) * inner_h
-            points.append((x, y))
+        if self._xs_key != (n, w, pad):
+            sx = inner_w / (n - 1)
+            self._xs_cache = [pad + i * sx for i in range(n)]
+            self._xs_key = (n, w, pad)
+        # higher value -> higher on chart: y = pad + (1 - (v - mn) / rng) * inner_h
+        sy = inner_h / (mx - mn)
+        y0 = pad + inner_h + mn * sy
 
         # Draw polyline
-        flat = []
-        for x, y in points:
-            flat.extend([x, y])
+        flat = [0.0] * (2 * n)
+        flat[0::2] = self._xs_cache
+        flat[1::2] = [y0 - v * sy for v in vals]
         try:
             self.create_line(*flat, fill=self._fg(), width=2, smooth=True)
         except Exception:
@@ -2591,7 +3575,20 @@ class DesktopWidgetWindow(tk.Toplevel):
     """
 
     _DESKTOP_CHECK_MS = 420
-    _DATA_TICK_MS = 900
+    _UNSET = object()
+    # widget type -> method names; unknown types render as price widgets
+    _SIG_HANDLERS: Dict[str, str] = {
+        "price": "_sig_price",
+        "movers": "_sig_movers",
+        "portfolio": "_sig_portfolio",
+    }
+    _UPDATE_HANDLERS: Dict[str, str] = {
+        "price": "_update_price",
+        "movers": "_update_movers",
+        "portfolio": "_update_portfolio",
+    }
+    # Quarter-circle samples (cos, sin) for the rounded corners; scaled by the radius
+    _CORNER_ARC = tuple((math.cos(math.radians(a)), math.sin(math.radians(a))) for a in range(0, 91, 18))
 
     def __init__(
         self,
@@ -2611,10 +3608,29 @@ class DesktopWidgetWindow(tk.Toplevel):
         self._drag_dx = 0
         self._drag_dy = 0
         self._dragging = False
+        self._visibility_polling = False
+        # Last applied desktop-foreground state (None until the first check)
+        self._on_desktop: Optional[bool] = None
 
         self._transparent_key = "#ff00ff"  # magenta; used as transparent background on Windows
-        self._last_sig: Optional[str] = None
+        self._last_sig: Optional[Tuple[Any, ...]] = None
         self._render_cache: Dict[str, Any] = {}
+        # Per-type signature/update handlers, resolved once (the widget type never changes)
+        self._sig_fn = getattr(self, self._SIG_HANDLERS.get(cfg._wtype, "_sig_price"))
+        self._upd_fn = getattr(self, self._UPDATE_HANDLERS.get(cfg._wtype, "_update_price"))
+        # Bumped whenever _render_cache changes; with size/palette/language it keys the last paint
+        self._render_version = 0
+        self._drawn_key: Optional[Tuple[Any, ...]] = None
+        # Canvas state from the last full rebuild; text-only changes reuse the items
+        self._frame_sig: Optional[Tuple[Any, ...]] = None
+        self._text_ids: List[int] = []
+        self._drawn_specs: List[Tuple[float, float, str, str, Any]] = []
+        # Palette colours, re-read only when the app's palette version/appearance changes
+        self._pal_key: Optional[Tuple[int, str]] = None
+        self._pal_tuple: Tuple[str, str, str, str, str, str] = ("",) * 6
+        # (size, bold) -> font tuple; fonts only depend on the UI language
+        self._fonts: Dict[Tuple[int, bool], Tuple[Any, ...]] = {}
+        self._fonts_lang: Optional[str] = None
 
         self.overrideredirect(True)
 
@@ -2650,7 +3666,8 @@ class DesktopWidgetWindow(tk.Toplevel):
         self.canvas.tag_bind("remove_dot", "<Enter>", lambda e: self.canvas.configure(cursor="hand2"))
         self.canvas.tag_bind("remove_dot", "<Leave>", lambda e: self.canvas.configure(cursor=""))
 
-        self.bind("<Configure>", lambda e: self._redraw(force=True))
+        # Moves don't change the frame signature, so they skip the rebuild
+        self.bind("<Configure>", lambda e: self._redraw())
 
         self._redraw(force=True)
 
@@ -2678,133 +3695,180 @@ class DesktopWidgetWindow(tk.Toplevel):
             pass
 
         self._desktop_visibility_tick()
-        self._data_tick()
 
     def _rounded_rect(self, x1: float, y1: float, x2: float, y2: float, r: float, *, fill: str, outline: str, width: int) -> None:
         r = max(0.0, min(r, (x2 - x1) / 2.0, (y2 - y1) / 2.0))
+        l, t, rt, b = x1 + r, y1 + r, x2 - r, y2 - r
+
+        # One smoothed polygon walking the perimeter (fill and outline in a single item)
+        pts: List[float] = []
+        for c, s in self._CORNER_ARC:
+            pts += (rt + r * c, t - r * s)
+        for c, s in self._CORNER_ARC:
+            pts += (l - r * s, t - r * c)
+        for c, s in self._CORNER_ARC:
+            pts += (l - r * c, b + r * s)
+        for c, s in self._CORNER_ARC:
+            pts += (rt + r * s, b + r * c)
+
+        self.canvas.create_polygon(
+            pts,
+            smooth=True,
+            splinesteps=12,
+            fill=fill,
+            outline=outline if width > 0 else "",
+            width=max(0, width),
+        )
 
-        # fill
-        self.canvas.create_rectangle(x1 + r, y1, x2 - r, y2, fill=fill, outline="")
-        self.canvas.create_rectangle(x1, y1 + r, x2, y2 - r, fill=fill, outline="")
-        self.canvas.create_arc(x1, y1, x1 + 2 * r, y1 + 2 * r, start=90, extent=90, fill=fill, outline="")
-        self.canvas.create_arc(x2 - 2 * r, y1, x2, y1 + 2 * r, start=0, extent=90, fill=fill, outline="")
-        self.canvas.create_arc(x1, y2 - 2 * r, x1 + 2 * r, y2, start=180, extent=90, fill=fill, outline="")
-        self.canvas.create_arc(x2 - 2 * r, y2 - 2 * r, x2, y2, start=270, extent=90, fill=fill, outline="")
-
-        # outline
-        if width > 0:
-            self.canvas.create_arc(x1, y1, x1 + 2 * r, y1 + 2 * r, start=90, extent=90, style="arc", outline=outline, width=width)
-            self.canvas.create_arc(x2 - 2 * r, y1, x2, y1 + 2 * r, start=0, extent=90, style="arc", outline=outline, width=width)
-            self.canvas.create_arc(x1, y2 - 2 * r, x1 + 2 * r, y2, start=180, extent=90, style="arc", outline=outline, width=width)
-            self.canvas.create_arc(x2 - 2 * r, y2 - 2 * r, x2, y2, start=270, extent=90, style="arc", outline=outline, width=width)
-            self.canvas.create_line(x1 + r, y1, x2 - r, y1, fill=outline, width=width)
-            self.canvas.create_line(x1 + r, y2, x2 - r, y2, fill=outline, width=width)
-            self.canvas.create_line(x1, y1 + r, x1, y2 - r, fill=outline, width=width)
-            self.canvas.create_line(x2, y1 + r, x2, y2 - r, fill=outline, width=width)
-
-    def _redraw(self, *, force: bool = False) -> None:
-        w = int(self.winfo_width() or self.cfg.width or config.WIDGET_WIDTH)
-        h = int(self.winfo_height() or self.cfg.height or config.WIDGET_HEIGHT)
-
-        self.canvas.delete("all")
-
-        try:
-            pal = self.app._widget_palette()
-        except Exception:
-            pal = {
-                "bg": "#0a0a0c",
-                "fill": "#151518",
-                "border": "#2c2c2e",
-                "txt": "#f5f5f7",
-                "sub": "#a1a1a6",
-                "dot": "#1c1c1e",
-                "shine": "#7DA7FF",
-            }
-
-        fill = pal.get("fill", "#151518")
-        border = pal.get("border", "#2c2c2e")
-        txt = pal.get("txt", "#f5f5f7")
-        sub = pal.get("sub", "#a1a1a6")
-
-        # Single rounded widget surface (no outer sharp box)
-        self._rounded_rect(0, 0, w, h, 20, fill=fill, outline=border, width=1)
-
-        # Glass shine hint
-        try:
-            shine = pal.get("shine", "#7DA7FF")
-            self.canvas.create_line(18, 14, w - 18, 14, fill=shine, width=1)
-        except Exception:
-            pass
-
-        # Remove dot (top-right)
-        dot_r = 10
-        cx = w - 18
-        cy = 18
-        dot_fill = pal.get("dot", "#1c1c1e")
-        self.canvas.create_oval(cx - dot_r, cy - dot_r, cx + dot_r, cy + dot_r, fill=dot_fill, outline=border, width=1, tags=("remove_dot",))
-        self.canvas.create_text(cx, cy + 0.5, text="●", fill=txt, font=self.app._ui_font(12, True), tags=("remove_dot",))
+    def _font(self, size: int, bold: bool = False) -> Tuple[Any, ...]:
+        key = (size, bold)
+        f = self._fonts.get(key)
+        if f is None:
+            f = self._fonts[key] = self.app._ui_font(size, bold)
+        return f
 
-        # Content
-        t = str(self.cfg.widget_type or "price").lower().strip()
+    def _text_specs(self, w: int, txt: str, sub: str) -> List[Tuple[float, float, str, str, Any]]:
+        """(x, y, text, fill, font) for each content line; all anchored nw."""
+        t = self.cfg._wtype
         padx = 18
         y = 36
+        out: List[Tuple[float, float, str, str, Any]] = []
 
         if t == "movers":
             title = self.app._t("widget_type_movers")
-            self.canvas.create_text(padx, y, text=title, fill=txt, anchor="nw", font=self.app._ui_font(13, True))
+            out.append((padx, y, title, txt, self._font(13, True)))
             y += 26
 
-            gainers = self._render_cache.get("gainers", [])
-            losers = self._render_cache.get("losers", [])
-
             left_x = padx
             right_x = w / 2 + 6
 
-            self.canvas.create_text(left_x, y, text=self.app._t("top_gainers"), fill=sub, anchor="nw", font=self.app._ui_font(11, True))
-            self.canvas.create_text(right_x, y, text=self.app._t("top_losers"), fill=sub, anchor="nw", font=self.app._ui_font(11, True))
+            out.append((left_x, y, self.app._t("top_gainers"), sub, self._font(11, True)))
+            out.append((right_x, y, self.app._t("top_losers"), sub, self._font(11, True)))
             y += 20
 
-            lines = max(len(gainers), len(losers), 3)
-            for i in range(lines):
-                g = gainers[i] if i < len(gainers) else ("—", 0.0)
-                l = losers[i] if i < len(losers) else ("—", 0.0)
-                self.canvas.create_text(left_x, y + i * 18, text=f"{g[0]}  {g[1]:+.2f}%", fill=txt, anchor="nw", font=self.app._ui_font(11, False))
-                self.canvas.create_text(right_x, y + i * 18, text=f"{l[0]}  {l[1]:+.2f}%", fill=txt, anchor="nw", font=self.app._ui_font(11, False))
-            return
+            # Rows arrive pre-formatted and padded to equal length
+            row_font = self._font(11, False)
+            gainer_rows = self._render_cache.get("gainer_rows", _MOVER_EMPTY_ROWS)
+            loser_rows = self._render_cache.get("loser_rows", _MOVER_EMPTY_ROWS)
+            for i, (g, l) in enumerate(zip(gainer_rows, loser_rows)):
+                out.append((left_x, y + i * 18, g, txt, row_font))
+                out.append((right_x, y + i * 18, l, txt, row_font))
+            return out
 
         if t == "portfolio":
             title = self.app._t("widget_type_portfolio")
-            self.canvas.create_text(padx, y, text=title, fill=txt, anchor="nw", font=self.app._ui_font(13, True))
+            out.append((padx, y, title, txt, self._font(13, True)))
             y += 28
 
             total = int(self._render_cache.get("total", 0) or 0)
-            best = self._render_cache.get("best", ("—", 0.0))
-            worst = self._render_cache.get("worst", ("—", 0.0))
+            best = self._render_cache.get("best_row", _MOVER_EMPTY_ROW)
+            worst = self._render_cache.get("worst_row", _MOVER_EMPTY_ROW)
             upd = self._render_cache.get("updated", "—")
 
-            self.canvas.create_text(padx, y, text=f"{self.app._t('portfolio_items')}: {total}", fill=txt, anchor="nw", font=self.app._ui_font(12, False))
+            out.append((padx, y, f"{self.app._t('portfolio_items')}: {total}", txt, self._font(12, False)))
             y += 22
-            self.canvas.create_text(padx, y, text=f"{self.app._t('best')}: {best[0]}  {float(best[1]):+.2f}%", fill=sub, anchor="nw", font=self.app._ui_font(11, False))
+            out.append((padx, y, f"{self.app._t('best')}: {best}", sub, self._font(11, False)))
             y += 18
-            self.canvas.create_text(padx, y, text=f"{self.app._t('worst')}: {worst[0]}  {float(worst[1]):+.2f}%", fill=sub, anchor="nw", font=self.app._ui_font(11, False))
+            out.append((padx, y, f"{self.app._t('worst')}: {worst}", sub, self._font(11, False)))
             y += 24
-            self.canvas.create_text(padx, y, text=f"{self.app._t('updated')}: {upd}", fill=sub, anchor="nw", font=self.app._ui_font(10, False))
-            return
+            out.append((padx, y, f"{self.app._t('updated')}: {upd}", sub, self._font(10, False)))
+            return out
 
         # price
-        sym = str(self.cfg.symbol or "USD").upper().strip()
+        sym = self.cfg._sym or "USD"
         title = f"{self.app._t('widget_type_price')}: {sym}"
-        self.canvas.create_text(padx, y, text=title, fill=txt, anchor="nw", font=self.app._ui_font(13, True))
+        out.append((padx, y, title, txt, self._font(13, True)))
         y += 30
 
-        price_str = self._render_cache.get("price_str", "—")
+        price_title = self._render_cache.get("price_title") or f"— {self.app._t('toman')}"
         change_str = self._render_cache.get("change_str", "")
-        unit = self._render_cache.get("unit", self.app._t("toman"))
 
-        self.canvas.create_text(padx, y, text=f"{price_str} {unit}", fill=txt, anchor="nw", font=self.app._ui_font(18, True))
+        out.append((padx, y, price_title, txt, self._font(18, True)))
         y += 28
         if change_str:
-            self.canvas.create_text(padx, y, text=change_str, fill=sub, anchor="nw", font=self.app._ui_font(12, False))
+            out.append((padx, y, change_str, sub, self._font(12, False)))
+        return out
+
+    def _extract_palette(self) -> Tuple[str, str, str, str, str, str]:
+        """(fill, border, txt, sub, dot, shine) from the app's widget palette."""
+        try:
+            pal = self.app._widget_palette()
+        except Exception:
+            pal = {}
+        return (
+            pal.get("fill", "#151518"),
+            pal.get("border", "#2c2c2e"),
+            pal.get("txt", "#f5f5f7"),
+            pal.get("sub", "#a1a1a6"),
+            pal.get("dot", "#1c1c1e"),
+            pal.get("shine", "#7DA7FF"),
+        )
+
+    def _redraw(self, *, force: bool = False) -> None:
+        w = int(self.winfo_width() or self.cfg.width or config.WIDGET_WIDTH)
+        h = int(self.winfo_height() or self.cfg.height or config.WIDGET_HEIGHT)
+
+        # "auto" widget palettes follow the appearance mode, which can flip with the OS theme
+        try:
+            pal_key = (getattr(self.app, "_palette_version", 0), ctk.get_appearance_mode())
+        except Exception:
+            pal_key = None
+        if pal_key is None or pal_key != self._pal_key:
+            self._pal_tuple = self._extract_palette()
+            self._pal_key = pal_key
+        fill, border, txt, sub, dot_fill, shine = self._pal_tuple
+
+        lang = getattr(self.app, "language", None)
+        # Nothing that feeds the canvas changed since the last paint
+        drawn_key = (self._render_version, w, h, pal_key, lang) if pal_key is not None else None
+        if not force and drawn_key is not None and drawn_key == self._drawn_key:
+            return
+        self._drawn_key = drawn_key
+
+        if lang != self._fonts_lang:
+            self._fonts.clear()
+            self._fonts_lang = lang
+        dot_font = self._font(12, True)
+
+        specs = self._text_specs(w, txt, sub)
+        frame_sig = (w, h, fill, border, txt, shine, dot_fill, dot_font)
+
+        # Same surface and line count: only touch the text items that changed
+        if not force and frame_sig == self._frame_sig and len(specs) == len(self._text_ids):
+            for item, old, new in zip(self._text_ids, self._drawn_specs, specs):
+                if new == old:
+                    continue
+                if new[:2] != old[:2]:
+                    self.canvas.coords(item, new[0], new[1])
+                self.canvas.itemconfigure(item, text=new[2], fill=new[3], font=new[4])
+            self._drawn_specs = specs
+            return
+
+        self.canvas.delete("all")
+
+        # Single rounded widget surface (no outer sharp box)
+        self._rounded_rect(0, 0, w, h, 20, fill=fill, outline=border, width=1)
+
+        # Glass shine hint
+        try:
+            self.canvas.create_line(18, 14, w - 18, 14, fill=shine, width=1)
+        except Exception:
+            pass
+
+        # Remove dot (top-right)
+        dot_r = 10
+        cx = w - 18
+        cy = 18
+        self.canvas.create_oval(cx - dot_r, cy - dot_r, cx + dot_r, cy + dot_r, fill=dot_fill, outline=border, width=1, tags=("remove_dot",))
+        self.canvas.create_text(cx, cy + 0.5, text="●", fill=txt, font=dot_font, tags=("remove_dot",))
+
+        # Content
+        self._text_ids = [
+            self.canvas.create_text(x, y, text=text, fill=color, anchor="nw", font=font)
+            for x, y, text, color, font in specs
+        ]
+        self._drawn_specs = specs
+        self._frame_sig = frame_sig
 
     def _remove_clicked(self, _event=None) -> None:
         try:
@@ -2865,10 +3929,35 @@ class DesktopWidgetWindow(tk.Toplevel):
         if not IS_WINDOWS:
             return
 
+        mgr = getattr(self.app, "widget_manager", None)
+        if mgr is not None and mgr.foreground_events:
+            # Event-driven: the manager pushes changes, so just sync once and stop polling
+            self._visibility_polling = False
+            self.apply_desktop_visibility(mgr.desktop_foreground)
+            return
+        if self._visibility_polling:
+            return
+        self._visibility_polling = True
+        self._visibility_poll()
+
+    def _visibility_poll(self) -> None:
+        mgr = getattr(self.app, "widget_manager", None)
+        if mgr is not None and mgr.foreground_events:
+            self._visibility_polling = False
+            return
+
         try:
             on_desktop = DesktopWindowHelper.is_desktop_foreground()
         except Exception:
             on_desktop = True
+        self.apply_desktop_visibility(on_desktop)
+        self.after(self._DESKTOP_CHECK_MS, self._visibility_poll)
+
+    def apply_desktop_visibility(self, on_desktop: bool) -> None:
+        # Only transitions touch the z-order; repeated polls with the same verdict are no-ops
+        if on_desktop == self._on_desktop:
+            return
+        self._on_desktop = on_desktop
 
         if on_desktop:
             try:
@@ -2877,18 +3966,13 @@ class DesktopWidgetWindow(tk.Toplevel):
             except Exception:
                 pass
 
-            # Keep above wallpaper/icons but never overlay apps (we hide when apps are focused)
+            # Keep above wallpaper/icons but never overlay apps (we drop to the bottom when apps are focused)
             try:
-                self.attributes("-topmost", True)
-                self.after(30, lambda: self.attributes("-topmost", False))
+                self.lift()
             except Exception:
                 pass
         else:
             # Keep the widget behind other windows. It will naturally disappear when apps are in front.
-            try:
-                self.attributes("-topmost", False)
-            except Exception:
-                pass
             if IS_WINDOWS:
                 try:
                     hwnd = int(self.winfo_id())
@@ -2896,36 +3980,37 @@ class DesktopWidgetWindow(tk.Toplevel):
                 except Exception:
                     pass
 
-        self.after(self._DESKTOP_CHECK_MS, self._desktop_visibility_tick)
-
-    def _data_tick(self) -> None:
-        try:
-            currencies = getattr(self.app, "currencies", {}) or {}
-        except Exception:
-            currencies = {}
-
+    # Tuples: no string building, and comparison stops at the first differing field
+    def _sig_price(self, snap: Dict[str, Any], currencies: Dict[str, Dict[str, Any]]) -> Tuple[Any, ...]:
+        sym = self.cfg._sym
+        lang = getattr(self.app, "language", "fa")
+        d = currencies.get(sym)
+        if isinstance(d, dict):
+            return ("price", sym, d.get("price"), d.get("change_percent"), d.get("unit"), lang)
+        return ("price", sym, None, None, None, lang)
+
+    def _sig_movers(self, snap: Dict[str, Any], currencies: Dict[str, Dict[str, Any]]) -> Tuple[Any, ...]:
+        # Row tuples are rebuilt only with the snapshot, so unchanged ones compare by identity
+        return ("movers", snap.get("gainer_rows"), snap.get("loser_rows"))
+
+    def _sig_portfolio(self, snap: Dict[str, Any], currencies: Dict[str, Dict[str, Any]]) -> Tuple[Any, ...]:
+        return ("portfolio", snap.get("total"), snap.get("best"), snap.get("worst"), snap.get("updated"))
+
+    def apply_snapshot(self, snap: Dict[str, Any]) -> bool:
+        """Refresh from the manager's shared snapshot; True if this widget's inputs changed."""
+        currencies = snap.get("currencies") or _EMPTY_DICT
+        sig = self._sig_fn(snap, currencies)
+        if sig == self._last_sig:
+            return False
+        self._last_sig = sig
+        # Only the render/Tk side can fail here; a torn-down window is the manager's to reap
         try:
-            t = str(self.cfg.widget_type or "price").lower().strip()
-            sig = f"{t}|lang:{getattr(self.app,'language','fa')}"
-            if t == "price":
-                sym = str(self.cfg.symbol or "").upper().strip()
-                d = currencies.get(sym) or {}
-                sig = f"price|{sym}|{d.get('price')}|{d.get('change_percent')}|{d.get('unit')}|lang:{getattr(self.app, 'language', 'fa')}"
-            elif t == "movers":
-                sig = f"movers|{getattr(self.app,'top_gainers',None)}|{getattr(self.app,'top_losers',None)}"
-            elif t == "portfolio":
-                sig = f"portfolio|{sorted(list(getattr(self.app,'user_portfolio',set()) or []))}|{getattr(self.app,'last_update','')}"
-        except Exception:
-            sig = None
-
-        if sig is not None and sig != self._last_sig:
-            self._last_sig = sig
-            try:
-                self.update_from_data(currencies)
-            except Exception:
-                pass
-
-        self.after(self._DATA_TICK_MS, self._data_tick)
+            self.update_from_data(currencies)
+        except tk.TclError:
+            raise
+        except Exception as e:
+            logger.debug(f"Desktop widget update failed: {e}")
+        return True
 
     def apply_typography(self) -> None:
         """Re-apply fonts + refresh rendered strings (language/unit labels)"""
@@ -2947,49 +4032,43 @@ class DesktopWidgetWindow(tk.Toplevel):
         self._redraw(force=True)
 
     def update_from_data(self, currencies: Dict[str, Dict[str, Any]]) -> None:
-        t = str(self.cfg.widget_type or "price").lower().strip()
+        self._upd_fn(currencies)
 
-        if t == "movers":
-            gainers = list(getattr(self.app, "top_gainers", []) or [])[:3]
-            losers = list(getattr(self.app, "top_losers", []) or [])[:3]
-            self._render_cache["gainers"] = [(g[0], float(g[1])) for g in gainers] if gainers else []
-            self._render_cache["losers"] = [(l[0], float(l[1])) for l in losers] if losers else []
-            self._redraw()
-            return
+    def _shared_snapshot(self, currencies: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        mgr = getattr(self.app, "widget_manager", None)
+        return mgr.snapshot_for(currencies) if mgr is not None else {}
 
-        if t == "portfolio":
-            items = list(getattr(self.app, "user_portfolio", set()) or [])
-            total = len(items)
-            best = ("—", 0.0)
-            worst = ("—", 0.0)
-            for sym in items:
-                d = currencies.get(str(sym).upper().strip()) or {}
-                try:
-                    ch = float(d.get("change_percent", 0) or 0)
-                except Exception:
-                    ch = 0.0
-                if best[0] == "—" or ch > best[1]:
-                    best = (str(sym).upper().strip(), ch)
-                if worst[0] == "—" or ch < worst[1]:
-                    worst = (str(sym).upper().strip(), ch)
-
-            self._render_cache["total"] = total
-            self._render_cache["best"] = best
-            self._render_cache["worst"] = worst
-            self._render_cache["updated"] = getattr(self.app, "last_update", "—")
-            self._redraw()
-            return
+    def _update_movers(self, currencies: Dict[str, Dict[str, Any]]) -> None:
+        snap = self._shared_snapshot(currencies)
+        self._update_cache(
+            gainer_rows=snap.get("gainer_rows", _MOVER_EMPTY_ROWS),
+            loser_rows=snap.get("loser_rows", _MOVER_EMPTY_ROWS),
+        )
 
-        # price
-        sym = str(self.cfg.symbol or "").upper().strip()
+    def _update_portfolio(self, currencies: Dict[str, Dict[str, Any]]) -> None:
+        snap = self._shared_snapshot(currencies)
+        self._update_cache(
+            total=snap.get("total", 0),
+            best_row=snap.get("best_row", _MOVER_EMPTY_ROW),
+            worst_row=snap.get("worst_row", _MOVER_EMPTY_ROW),
+            updated=snap.get("updated", "—"),
+        )
+
+    def _update_price(self, currencies: Dict[str, Dict[str, Any]]) -> None:
+        sym = self.cfg._sym
         d = currencies.get(sym) or {}
         price_str = "—"
         raw_unit = d.get("unit") or ""
+        mgr = getattr(self.app, "widget_manager", None)
+        if mgr is not None:
+            unit = mgr.unit_label(raw_unit)
+        else:
+            try:
+                unit = self.app._unit_display(raw_unit) if raw_unit else self.app._t("toman")
+            except Exception:
+                unit = raw_unit or self.app._t("toman")
         try:
-            unit = self.app._unit_display(raw_unit) if raw_unit else self.app._t("toman")
-        except Exception:
-            unit = raw_unit or self.app._t("toman")
-        try:
+            # Memoized per value (_format_price_num is lru-cached), so repeated ticks are a cache hit
             price_str = CurrencyCardWidget._format_price(float(d.get("price", 0) or 0))
         except Exception:
             pass
@@ -3001,23 +4080,67 @@ class DesktopWidgetWindow(tk.Toplevel):
         except Exception:
             pass
 
-        self._render_cache["price_str"] = price_str
-        self._render_cache["change_str"] = ch_str
-        self._render_cache["unit"] = unit
-        self._redraw()
+        # Formatted here (on data change) so _redraw only reads final strings
+        self._update_cache(price_title=f"{price_str} {unit}", change_str=ch_str)
+
+    def _update_cache(self, **values: Any) -> None:
+        """Merge values into the render cache; bump its version and queue a redraw only if any differ."""
+        cache = self._render_cache
+        unset = self._UNSET
+        if all(cache.get(k, unset) == v for k, v in values.items()):
+            return
+        cache.update(values)
+        self._render_version += 1
+        self._request_redraw()
+
+    def _request_redraw(self) -> None:
+        """Redraw on the manager's next coalesced idle pass (immediately if unmanaged)."""
+        mgr = getattr(self.app, "widget_manager", None)
+        if mgr is None or mgr.widgets.get(str(self.cfg.widget_id)) is not self:
+            self._redraw()
+            return
+        mgr.request_redraw(self)
 
     def apply_typography(self) -> None:
         try:
             self._last_sig = None
         except Exception:
             pass
+        self._fonts.clear()
         self._redraw(force=True)
 
+def _mover_row(item: Tuple[str, float]) -> str:
+    return f"{item[0]}  {float(item[1]):+.2f}%"
+
+
+_MOVER_EMPTY_ROW = _mover_row(("—", 0.0))
+_MOVER_EMPTY_ROWS: Tuple[str, ...] = (_MOVER_EMPTY_ROW,) * 3
+
+
 class DesktopWidgetManager:
+    _SNAPSHOT_TICK_MS = 900
+    # Idle ticks back off exponentially up to this interval. Data pushes go through
+    # update_all() and leave it alone; only a new widget or a tick that saw a change resets it.
+    _SNAPSHOT_TICK_MAX_MS = 5000
+
     def __init__(self, app: Any):
         self.app = app
         self.widgets: Dict[str, DesktopWidgetWindow] = {}
         self._restore_done = False
+        # Movers/portfolio summary computed once per data change and shared by every widget
+        self.snapshot: Dict[str, Any] = {}
+        self._snapshot_src: Optional[Dict[str, Dict[str, Any]]] = None
+        self._snapshot_key: Optional[Tuple[Any, ...]] = None
+        self._tick_after_id: Optional[str] = None
+        self._tick_ms = self._SNAPSHOT_TICK_MS
+        # (raw unit, language) -> display label, shared by every price widget
+        self._unit_labels: Dict[Tuple[str, str], str] = {}
+        # Widgets whose render cache changed; redrawn together in one after_idle pass
+        self._dirty: Dict[str, DesktopWidgetWindow] = {}
+        self._redraw_scheduled = False
+        # Set by the tray's foreground hook; while active, widgets don't poll
+        self.foreground_events = False
+        self.desktop_foreground = True
 
     def restore(self) -> None:
         if self._restore_done:
@@ -3036,6 +4159,12 @@ class DesktopWidgetManager:
             pass
 
     def shutdown(self) -> None:
+        if self._tick_after_id is not None:
+            try:
+                self.app.after_cancel(self._tick_after_id)
+            except Exception:
+                pass
+            self._tick_after_id = None
         for wid in list(self.widgets.keys()):
             try:
                 self.remove(wid, save=False)
@@ -3054,6 +4183,8 @@ class DesktopWidgetManager:
         except Exception:
             return
 
+        self._wake()
+
         # Update the UI list if present
         try:
             if hasattr(self.app, "_refresh_widgets_ui"):
@@ -3117,19 +4248,180 @@ class DesktopWidgetManager:
         except Exception:
             pass
 
-    def update_all(self, currencies: Dict[str, Dict[str, Any]]) -> None:
+    def set_foreground_events(self, active: bool, on_desktop: Optional[bool]) -> None:
+        self.foreground_events = bool(active)
+        if active:
+            if on_desktop is not None:
+                self.set_desktop_foreground(on_desktop)
+            return
+        # Hook gone: restart polling on every widget
         for win in list(self.widgets.values()):
             try:
-                win.update_from_data(currencies)
+                win._desktop_visibility_tick()
             except Exception:
                 continue
 
+    def set_desktop_foreground(self, on_desktop: bool) -> None:
+        self.desktop_foreground = bool(on_desktop)
+        for win in list(self.widgets.values()):
+            try:
+                win.apply_desktop_visibility(self.desktop_foreground)
+            except Exception:
+                continue
+
+    def snapshot_for(self, currencies: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Shared movers/portfolio summary for `currencies`, rebuilt only when inputs change."""
+        # O(1) change check: the app bumps _portfolio_version whenever user_portfolio changes
+        key = (getattr(self.app, "_portfolio_version", 0), getattr(self.app, "last_update", "—"))
+        if currencies is self._snapshot_src and key == self._snapshot_key:
+            return self.snapshot
+        portfolio = tuple(sorted(getattr(self.app, "user_portfolio", set()) or ()))
+
+        movers: List[Tuple[str, float]] = []
+        for sym, d in currencies.items():
+            ch = d.get("change_percent") if isinstance(d, dict) else None
+            if not isinstance(ch, float):
+                try:
+                    ch = float(ch or 0)
+                except (TypeError, ValueError):
+                    continue
+            movers.append((sym, ch))
+        movers.sort(key=lambda m: m[1], reverse=True)
+        gainers = [m for m in movers if m[1] > 0][:3]
+        losers = sorted([m for m in movers if m[1] < 0], key=lambda m: m[1])[:3]
+
+        # Normalize each symbol once, then one pass for (symbol, change) and min/max over it
+        pairs: List[Tuple[str, float]] = []
+        for sym in [str(s).upper().strip() for s in portfolio]:
+            ch = (currencies.get(sym) or _EMPTY_DICT).get("change_percent") or 0.0
+            if not isinstance(ch, float):
+                try:
+                    ch = float(ch)
+                except (TypeError, ValueError):
+                    ch = 0.0
+            pairs.append((sym, ch))
+        best = max(pairs, key=lambda p: p[1], default=("—", 0.0))
+        worst = min(pairs, key=lambda p: p[1], default=("—", 0.0))
+
+        # Display rows are formatted once here instead of per widget per frame
+        rows = max(len(gainers), len(losers), 3)
+        self.snapshot = {
+            "currencies": currencies,
+            "gainers": gainers,
+            "losers": losers,
+            "gainer_rows": tuple(map(_mover_row, gainers)) + _MOVER_EMPTY_ROWS[: rows - len(gainers)],
+            "loser_rows": tuple(map(_mover_row, losers)) + _MOVER_EMPTY_ROWS[: rows - len(losers)],
+            "total": len(portfolio),
+            "best": best,
+            "worst": worst,
+            "best_row": _mover_row(best),
+            "worst_row": _mover_row(worst),
+            "updated": key[1],
+        }
+        self._snapshot_src = currencies
+        self._snapshot_key = key
+        return self.snapshot
+
+    def _snapshot_tick(self) -> None:
+        """One timer for all widgets: rebuild the snapshot once, then fan it out."""
+        self._tick_after_id = None
+        if not self.widgets:
+            return
+        changed = True
+        try:
+            changed = self._fan_out(self.snapshot_for(self.app.currencies or {}))
+        except Exception as e:
+            logger.debug(f"Desktop widget tick failed: {e}")
+        finally:
+            # Always re-arm, or one bad tick would stop every widget for good
+            if changed:
+                self._tick_ms = self._SNAPSHOT_TICK_MS
+            else:
+                self._tick_ms = min(self._tick_ms * 2, self._SNAPSHOT_TICK_MAX_MS)
+            if self.widgets:
+                self._tick_after_id = self.app.after(self._tick_ms, self._snapshot_tick)
+
+    def _wake(self) -> None:
+        """Reset the tick to its base interval (a new widget just arrived)."""
+        self._tick_ms = self._SNAPSHOT_TICK_MS
+        if self._tick_after_id is not None:
+            try:
+                self.app.after_cancel(self._tick_after_id)
+            except Exception:
+                pass
+        self._tick_after_id = self.app.after(self._tick_ms, self._snapshot_tick)
+
+    def update_all(self, currencies: Dict[str, Dict[str, Any]]) -> None:
+        """Push new data to every widget; widgets whose inputs didn't change skip the update.
+
+        The app calls this whenever its data or portfolio changes, so the shared tick
+        only has to act as a slow keepalive (it backs off once pushes keep it idle).
+        """
+        if not self.widgets:
+            return
+        self._fan_out(self.snapshot_for(currencies))
+
+    def _fan_out(self, snap: Dict[str, Any]) -> bool:
+        """Hand the snapshot to every widget; True if any of them changed."""
+        changed = False
+        dead: List[str] = []
+        for wid, win in list(self.widgets.items()):
+            try:
+                if not win.winfo_exists():
+                    dead.append(wid)  # window destroyed outside the manager
+                    continue
+                changed = win.apply_snapshot(snap) or changed
+            except tk.TclError:
+                dead.append(wid)
+        for wid in dead:
+            self.remove(wid, save=False)
+        return changed
+
+    def request_redraw(self, win: DesktopWidgetWindow) -> None:
+        self._dirty[str(win.cfg.widget_id)] = win
+        if self._redraw_scheduled:
+            return
+        self._redraw_scheduled = True
+        try:
+            self.app.after_idle(self._flush_redraws)
+        except Exception:
+            self._flush_redraws()
+
+    def _flush_redraws(self) -> None:
+        self._redraw_scheduled = False
+        dirty, self._dirty = self._dirty, {}
+        for wid, win in dirty.items():
+            if self.widgets.get(wid) is not win:
+                continue  # removed while queued
+            try:
+                win._redraw()
+            except Exception:
+                continue
+
+    def unit_label(self, raw_unit: str) -> str:
+        """Display label for a raw unit in the current language (cached)."""
+        key = (raw_unit, str(getattr(self.app, "language", "fa")))
+        label = self._unit_labels.get(key)
+        if label is None:
+            try:
+                label = self.app._unit_display(raw_unit) if raw_unit else self.app._t("toman")
+            except Exception:
+                label = raw_unit or self.app._t("toman")
+            self._unit_labels[key] = label
+        return label
+
     def apply_typography(self) -> None:
+        self._unit_labels.clear()
         for win in list(self.widgets.values()):
             try:
                 win.apply_typography()
             except Exception:
                 continue
+        # Signatures were reset above; re-run the updates so unit labels pick up the new language
+        try:
+            self.update_all(self.app.currencies or {})
+        except Exception as e:
+            logger.debug(f"Desktop widget typography refresh failed: {e}")
 
     def get_summaries(self) -> List[str]:
         out: List[str] = []
@@ -3182,6 +4474,8 @@ class LiquidGlassPriceTracker(ctk.CTk):
         # State
         self.currencies: Dict[str, Dict[str, Any]] = {}
         self.user_portfolio: set[str] = set()
+        # Bumped on every user_portfolio change so watchers can skip diffing the set
+        self._portfolio_version: int = 0
         self.featured_symbols: List[str] = []
 
         self.connection_status: ConnectionStatus = ConnectionStatus.DISCONNECTED
@@ -3189,6 +4483,8 @@ class LiquidGlassPriceTracker(ctk.CTk):
 
         # Preferences (defaults)
         self.selected_theme: str = "liquid_glass"
+        # Bumped on theme changes so desktop widgets re-read their palette
+        self._palette_version: int = 0
         self.auto_refresh_active: bool = True
         self.refresh_interval_seconds: int = config.DEFAULT_REFRESH_INTERVAL
         self.alerts_enabled: bool = True
@@ -3296,7 +4592,8 @@ class LiquidGlassPriceTracker(ctk.CTk):
 
         # Responsive layout
         try:
-            self.bind("<Configure>", self._on_window_resize)
+            # add="+" keeps the ToastManager's width tracker bound as well
+            self.bind("<Configure>", self._on_window_resize, add="+")
         except Exception:
             pass
 
@@ -3886,10 +5183,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
                 self.hero_subtitle_label.configure(text=self._t("hero_subtitle"), font=self._ui_font(18, False), anchor="e" if self.rtl else "w")
             if self.hero_version_label is not None:
                 ver = str(config.APP_VERSION)
-                if self.language == "fa":
-                    ver = ver.translate(str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹"))
-                else:
-                    ver = ver.translate(str.maketrans("۰۱۲۳۴۵۶۷۸۹", "0123456789"))
+                ver = fa_digits(ver) if self.language == "fa" else en_digits(ver)
                 self.hero_version_label.configure(text=self._t("hero_version", version=ver), font=self._ui_font(14, False), anchor="e" if self.rtl else "w")
         except Exception:
             pass
@@ -4082,10 +5376,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
         try:
             if hasattr(self, "last_update_label"):
                 tval = str(self.last_update)
-                if self.language == "fa":
-                    tval = tval.translate(str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹"))
-                else:
-                    tval = tval.translate(str.maketrans("۰۱۲۳۴۵۶۷۸۹", "0123456789"))
+                tval = fa_digits(tval) if self.language == "fa" else en_digits(tval)
                 self.last_update_label.configure(text=self._t("last_update", time=tval), font=self._ui_font(12, False))
         except Exception:
             pass
@@ -4183,6 +5474,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
             if new_lang == self.language:
                 return
             self.language = new_lang
+            tr_cache_clear()
             # Direction-dependent widgets (pack/grid order) must be rebuilt.
             self.rtl = is_rtl(self.language)
             db_manager.save_preference("language", self.language)
@@ -4358,7 +5650,13 @@ class LiquidGlassPriceTracker(ctk.CTk):
         self._render_portfolio_cards()
         self._update_currency_selector()
         self._refresh_symbol_menus()
-        self._update_insights()
+        # Sorted by SQL on the indexed change column; no per-row blob decode or Python sort
+        try:
+            gainers = [(ch, sym) for sym, _, ch in db_manager.load_top_movers(3, max_age_seconds=6 * 3600)]
+            losers = [(ch, sym) for sym, _, ch in db_manager.load_top_movers(3, losers=True, max_age_seconds=6 * 3600)]
+            self._update_insights((gainers, losers))
+        except Exception:
+            self._update_insights()
 
         self._update_connection_status(ConnectionStatus.CACHED)
         self._update_status_displays()
@@ -4429,6 +5727,13 @@ class LiquidGlassPriceTracker(ctk.CTk):
         # Auto refresh scheduler
         self._schedule_auto_refresh()
 
+        # Keep the history table bounded from the first run on
+        try:
+            self._last_history_prune = time.time()
+            self.executor.submit(db_manager.prune_price_history, int(config.HISTORY_RETENTION_DAYS))
+        except Exception:
+            pass
+
         # Small periodic tasks (history UI smoothness)
         try:
             self.after(20_000, self._periodic_light_tasks)
@@ -4451,14 +5756,26 @@ class LiquidGlassPriceTracker(ctk.CTk):
         except Exception:
             pass
 
+    def _fetch_status(self) -> ConnectionStatus:
+        """Status for the payload fetch_data_sync just returned (stale payloads show as cached)."""
+        return ConnectionStatus.CACHED if self.api_manager.last_data_stale else ConnectionStatus.CONNECTED
+
     def _initial_refresh_worker(self) -> None:
         try:
+            # Paint the previous run's payload right away; the forced fetch below replaces it
+            cached = self.api_manager.cached_data()
+            if cached:
+                cached_currencies = self.api_manager.process_currency_data(cached)
+                if cached_currencies:
+                    self._enqueue_ui(lambda: self._update_ui_with_data(cached_currencies, ConnectionStatus.CACHED, quiet=True))
+
             performance_monitor.inc("api_calls")
             data = self.api_manager.fetch_data_sync(force=True)
             if data:
                 currencies = self.api_manager.process_currency_data(data)
                 if currencies:
-                    self._enqueue_ui(lambda: self._update_ui_with_data(currencies, ConnectionStatus.CONNECTED, quiet=True))
+                    status = self._fetch_status()
+                    self._enqueue_ui(lambda: self._update_ui_with_data(currencies, status, quiet=True))
                     return
 
             # If primary payload was present but unparseable / empty, try backups explicitly
@@ -4466,7 +5783,8 @@ class LiquidGlassPriceTracker(ctk.CTk):
             if data2:
                 currencies2 = self.api_manager.process_currency_data(data2)
                 if currencies2:
-                    self._enqueue_ui(lambda: self._update_ui_with_data(currencies2, ConnectionStatus.CONNECTED, quiet=True))
+                    status2 = self._fetch_status()
+                    self._enqueue_ui(lambda: self._update_ui_with_data(currencies2, status2, quiet=True))
                     return
 
             self._enqueue_ui(lambda: self._update_connection_status(ConnectionStatus.ERROR))
@@ -4524,7 +5842,8 @@ class LiquidGlassPriceTracker(ctk.CTk):
             if data:
                 currencies = self.api_manager.process_currency_data(data)
                 if currencies:
-                    self._enqueue_ui(lambda: self._update_ui_with_data(currencies, ConnectionStatus.CONNECTED, quiet=True))
+                    status = self._fetch_status()
+                    self._enqueue_ui(lambda: self._update_ui_with_data(currencies, status, quiet=True))
                     return
             self._enqueue_ui(lambda: self._update_connection_status(ConnectionStatus.ERROR))
         except Exception:
@@ -5407,8 +6726,9 @@ class LiquidGlassPriceTracker(ctk.CTk):
         if self.history_sparkline is not None:
             self.history_sparkline.clear()
 
-        since_ts = time.time() - float(max(60, period_seconds))
-        self._history_last_loaded = time.time()
+        now = time.time()
+        since_ts = now - float(max(60, period_seconds))
+        self._history_last_loaded = now
 
         def worker():
             points = db_manager.load_price_history(sym, since_ts=since_ts, limit=2000)
@@ -5448,8 +6768,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
     def _apply_history_points(self, sym: str, points: List[Tuple[float, float]]) -> None:
         try:
             self._history_points.clear()
-            for ts, price in points[-config.HISTORY_MAX_POINTS :]:
-                self._history_points.append((float(ts), float(price)))
+            self._history_points.extend(points[-config.HISTORY_MAX_POINTS :])
             self._update_history_chart()
         except Exception:
             pass
@@ -5721,8 +7040,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
 
         try:
             amount_raw = (self.converter_amount_var.get() if self.converter_amount_var is not None else "1").strip()
-            amount_raw = amount_raw.translate(str.maketrans("۰۱۲۳۴۵۶۷۸۹", "0123456789"))
-            amount_raw = amount_raw.translate(str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789"))
+            amount_raw = en_digits(amount_raw)
             amount = float(amount_raw)
         except Exception:
             self.converter_result_label.configure(text="—")
@@ -6570,7 +7888,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
                         card.grid(row=0, column=idx, padx=config.CARD_PADDING, pady=config.CARD_PADDING, sticky="nsew")
 
             try:
-                card.update_data(self._display_currency_data(sym, data))
+                card.queue_update(self._display_currency_data(sym, data))
             except Exception:
                 pass
 
@@ -6631,7 +7949,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
                 card = CurrencyCardWidget(self.portfolio_container, on_remove=self._remove_currency, show_remove=True, font_getter=self._ui_font, rtl=self.rtl)
                 self.portfolio_cards[sym] = card
             card.grid(row=row, column=col, padx=config.CARD_PADDING, pady=config.CARD_PADDING, sticky="nsew")
-            card.update_data(self._display_currency_data(sym, data))
+            card.queue_update(self._display_currency_data(sym, data))
 
             col += 1
             if col >= self.grid_columns:
@@ -6671,19 +7989,23 @@ class LiquidGlassPriceTracker(ctk.CTk):
             pass
         self._selector_update_after_id = self.after(180, self._update_currency_selector)
 
-    def _update_insights(self) -> None:
+    def _update_insights(self, top_movers: Optional[Tuple[List[Tuple[float, str]], List[Tuple[float, str]]]] = None) -> None:
+        """Fill the gainers/losers panel; top_movers=(gainers, losers) skips scanning self.currencies."""
         try:
-            movers: List[Tuple[float, str]] = []
-            for sym, data in self.currencies.items():
-                try:
-                    ch = float(data.get("change_percent", 0) or 0)
-                except Exception:
-                    ch = 0.0
-                movers.append((ch, sym))
+            if top_movers is not None:
+                top_gainers, top_losers = top_movers
+            else:
+                movers: List[Tuple[float, str]] = []
+                for sym, data in self.currencies.items():
+                    try:
+                        ch = float(data.get("change_percent", 0) or 0)
+                    except Exception:
+                        ch = 0.0
+                    movers.append((ch, sym))
 
-            movers.sort(key=lambda x: x[0], reverse=True)
-            top_gainers = [m for m in movers if m[0] > 0][:3]
-            top_losers = sorted([m for m in movers if m[0] < 0], key=lambda x: x[0])[:3]
+                movers.sort(key=lambda x: x[0], reverse=True)
+                top_gainers = [m for m in movers if m[0] > 0][:3]
+                top_losers = sorted([m for m in movers if m[0] < 0], key=lambda x: x[0])[:3]
 
             gain_labels: List[ctk.CTkLabel] = self.ui_elements.get("top_gainers", [])
             loss_labels: List[ctk.CTkLabel] = self.ui_elements.get("top_losers", [])
@@ -6808,6 +8130,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
         if self.user_portfolio & legacy_auto_featured:
             self.user_portfolio -= legacy_auto_featured
             db_manager.save_selected_currencies(self.user_portfolio)
+        self._portfolio_version += 1
 
         # Language
         saved_lang = db_manager.load_preference("language", "en")
@@ -6902,9 +8225,11 @@ class LiquidGlassPriceTracker(ctk.CTk):
 
             if sym in self.currencies and sym not in self.user_portfolio and sym not in set(self.featured_symbols):
                 self.user_portfolio.add(sym)
+                self._portfolio_version += 1
                 db_manager.save_selected_currencies(self.user_portfolio)
                 self._render_portfolio_cards()
                 self._update_currency_selector()
+                self._push_portfolio_to_widgets()
                 self.toasts.show(self._t("toast_added", sym=sym), duration=1800)
         except Exception as e:
             logger.debug(f"Add currency failed: {e}")
@@ -6915,11 +8240,20 @@ class LiquidGlassPriceTracker(ctk.CTk):
             return
         if sym in self.user_portfolio:
             self.user_portfolio.remove(sym)
+            self._portfolio_version += 1
             db_manager.save_selected_currencies(self.user_portfolio)
             self._render_portfolio_cards()
             self._update_currency_selector()
+            self._push_portfolio_to_widgets()
             self.toasts.show(self._t("toast_removed", sym=sym), duration=1800)
 
+    def _push_portfolio_to_widgets(self) -> None:
+        # Portfolio widgets are push-driven like price updates
+        try:
+            self.widget_manager.update_all(self.currencies)
+        except Exception:
+            pass
+
     def _sort_portfolio_symbols(self, symbols: List[str]) -> List[str]:
         mode = self._normalize_sort_key(self.portfolio_sort_mode_key)
 
@@ -6960,7 +8294,8 @@ class LiquidGlassPriceTracker(ctk.CTk):
             if data:
                 currencies = self.api_manager.process_currency_data(data)
                 if currencies:
-                    self._enqueue_ui(lambda: self._update_ui_with_data(currencies, ConnectionStatus.CONNECTED, quiet=False))
+                    status = self._fetch_status()
+                    self._enqueue_ui(lambda: self._update_ui_with_data(currencies, status, quiet=False))
                     return
             self._enqueue_ui(lambda: self._handle_refresh_failed())
         except Exception:
@@ -6981,7 +8316,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
             performance_monitor.inc("api_calls")
             data = self.api_manager.fetch_data_sync(force=True)
             elapsed = time.time() - start
-            if data:
+            if data and not self.api_manager.last_data_stale:
                 currencies = self.api_manager.process_currency_data(data)
                 msg = self._t("api_test_ok", elapsed=elapsed, count=len(currencies))
                 self._enqueue_ui(lambda: messagebox.showinfo(self._t("api_test_title"), msg))
@@ -7068,9 +8403,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
         low = raw.lower()
 
         # Normalize digits (Persian/Arabic-Indic -> English)
-        norm = low.translate(str.maketrans("۰۱۲۳۴۵۶۷۸۹", "0123456789"))
-        norm = norm.translate(str.maketrans("٠١٢٣٤٥٦٧٨٩", "0123456789"))
-        norm = norm.replace(" ", "")
+        norm = en_digits(low).replace(" ", "")
 
         mapping = {"30s": 30, "60s": 60, "2m": 120, "5m": 300, "10m": 600, "15m": 900}
         if norm in mapping:
@@ -7099,13 +8432,12 @@ class LiquidGlassPriceTracker(ctk.CTk):
             sec = int(config.DEFAULT_REFRESH_INTERVAL)
 
         if self.language == "fa":
-            fa_digits = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
             if sec < 60:
-                return f"{str(sec).translate(fa_digits)} ثانیه"
+                return f"{fa_digits(str(sec))} ثانیه"
             if sec % 60 == 0:
                 m = sec // 60
-                return f"{str(m).translate(fa_digits)} دقیقه"
-            return f"{str(sec).translate(fa_digits)} ثانیه"
+                return f"{fa_digits(str(m))} دقیقه"
+            return f"{fa_digits(str(sec))} ثانیه"
 
         # English
         if sec < 60:
@@ -7306,6 +8638,7 @@ class LiquidGlassPriceTracker(ctk.CTk):
             return
 
         self.selected_theme = theme_key
+        self._palette_version += 1
         self._update_theme_button_states(theme_key)
         if save_preference:
             db_manager.save_preference("selected_theme", theme_key)
@@ -7413,6 +8746,7 @@ def main() -> None:
             pass
         raise
     finally:
+        db_manager.close()
         logger.info("Session ended")
 
 